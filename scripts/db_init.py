@@ -5,35 +5,26 @@ Combines schema scanning and relationship analysis for comprehensive database di
 """
 
 import argparse
-import json
+import functools
+import gzip
+import heapq
 import logging
 import sys
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
-try:
+if TYPE_CHECKING:
     import psycopg
-except ImportError:
-    print("Error: psycopg library not found. Please install it:")
-    print("  pip install 'psycopg[binary]'")
-    sys.exit(1)
 
-# Import functions from other scripts
+# Functions from the other scripts are imported where they are used, so
+# --load and library callers do not pay for importing psycopg. The shared
+# JSON helpers are the exception: schema_scanner itself loads psycopg lazily
 import os
 sys.path.insert(0, os.path.dirname(__file__))
 
-from schema_scanner import (
-    connect_to_database,
-    mask_connection_string,
-    scan_full_schema,
-    get_all_schemas
-)
-from relationship_analyzer import (
-    get_foreign_keys,
-    detect_many_to_many,
-    build_relationship_graph
-)
+from schema_scanner import dumps_json, loads_json
 
 # Configure logging
 logging.basicConfig(
@@ -43,22 +34,160 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def get_db_context_path(connection_string: str) -> str:
+@functools.lru_cache(maxsize=32)
+def mask_connection_string(conn_str: str) -> str:
+    """Mask password in connection string for safe display"""
+    try:
+        parsed = urlparse(conn_str)
+        if parsed.password:
+            return conn_str.replace(parsed.password, '***')
+        return conn_str
+    except Exception:
+        return "***connection string***"
+
+
+def get_context_hash(connection_string: str) -> str:
     """
-    Get path for storing database context
+    Get stable file-name hash for a database connection
 
     Args:
         connection_string: Database connection string
 
     Returns:
-        Path to context file
+        12-character hex hash of the masked connection string
     """
     import hashlib
     masked = mask_connection_string(connection_string)
-    hash_obj = hashlib.md5(masked.encode())
-    context_hash = hash_obj.hexdigest()[:12]
+    # 6-byte BLAKE2b digest gives the same 12 hex chars without relying on MD5
+    return hashlib.blake2b(masked.encode(), digest_size=6).hexdigest()
+
+
+def get_db_context_path(connection_string: str) -> str:
+    """
+    Get path for storing database context
+
+    Args:
+        connection_string: Database connection string
+
+    Returns:
+        Path to gzip-compressed context file
+    """
+    return f"/tmp/text2sql_context_{get_context_hash(connection_string)}.json.gz"
+
+
+def get_legacy_context_path(connection_string: str) -> str:
+    """
+    Get path of an uncompressed context file saved by older versions
+
+    Args:
+        connection_string: Database connection string
 
-    return f"/tmp/text2sql_context_{context_hash}.json"
+    Returns:
+        Path to plain JSON context file
+    """
+    return f"/tmp/text2sql_context_{get_context_hash(connection_string)}.json"
+
+
+def find_context_file(connection_string: str) -> Optional[Tuple[str, int]]:
+    """
+    Find the saved context file, preferring the compressed format
+
+    Args:
+        connection_string: Database connection string
+
+    Returns:
+        Tuple of (path, modification time in ns), or None if not found
+    """
+    for context_path in (get_db_context_path(connection_string),
+                         get_legacy_context_path(connection_string)):
+        try:
+            return context_path, os.stat(context_path).st_mtime_ns
+        except OSError:
+            continue
+    return None
+
+
+def get_summary_path(connection_string: str) -> str:
+    """
+    Get path for storing the rendered context summary
+
+    Args:
+        connection_string: Database connection string
+
+    Returns:
+        Path to summary file
+    """
+    return f"/tmp/text2sql_summary_{get_context_hash(connection_string)}.md"
+
+
+def scan_and_analyze(
+    conn: 'psycopg.Connection',
+    schema: str = 'public',
+    use_cache: bool = True,
+    cache_ttl: int = 3600,
+    connection_string: Optional[str] = None
+) -> Dict:
+    """
+    Scan schema and derive all relationship data with a single FK query
+
+    Foreign keys are fetched once; many-to-many detection and the
+    relationship graph are computed from them in Python, using column
+    counts from the schema scan instead of per-table catalog queries.
+
+    Args:
+        conn: Database connection
+        schema: Schema name (default: 'public')
+        use_cache: Whether to use the schema cache
+        cache_ttl: Cache TTL in seconds
+        connection_string: Connection string for cache key generation
+
+    Returns:
+        Dictionary with 'schema', 'foreign_keys', 'many_to_many' and 'graph'
+    """
+    from schema_scanner import scan_full_schema
+    from relationship_analyzer import (
+        get_foreign_keys,
+        detect_many_to_many_from,
+        build_graph_from_foreign_keys
+    )
+
+    schema_data = scan_full_schema(
+        conn,
+        schema=schema,
+        use_cache=use_cache,
+        cache_ttl=cache_ttl,
+        connection_string=connection_string
+    )
+
+    foreign_keys = get_foreign_keys(conn, schema)
+    column_counts = {
+        table['name']: len(table['columns'])
+        for table in schema_data['tables']
+    }
+    many_to_many = detect_many_to_many_from(foreign_keys, column_counts)
+
+    return {
+        'schema': schema_data,
+        'foreign_keys': foreign_keys,
+        'many_to_many': many_to_many,
+        'graph': build_graph_from_foreign_keys(foreign_keys, many_to_many)
+    }
+
+
+def group_foreign_keys_by_table(foreign_keys: List[Dict]) -> Dict[str, List[Dict]]:
+    """
+    Group foreign keys by their source table
+
+    Args:
+        foreign_keys: Foreign key relationship dictionaries
+
+    Returns:
+        Dictionary mapping table name to its outgoing foreign keys
+    """
+    by_table = defaultdict(list)
+    for fk in foreign_keys:
+        by_table[fk['from_table']].append(fk)
+    return dict(by_table)
 
 
 def initialize_database(
@@ -79,6 +208,8 @@ def initialize_database(
     Returns:
         Complete database context dictionary
     """
+    from schema_scanner import connect_to_database
+
     logger.info("=" * 60)
     logger.info("DATABASE INITIALIZATION")
     logger.info("=" * 60)
@@ -92,32 +223,28 @@ def initialize_database(
     logger.info(f"Scanning schema: {schema}")
     logger.info("")
 
-    # Step 1: Scan schema
-    logger.info("[1/3] Scanning database schema...")
-    schema_data = scan_full_schema(
+    # Step 1: Scan schema and analyze relationships
+    logger.info("[1/2] Scanning schema and analyzing relationships...")
+    scan = scan_and_analyze(
         conn,
         schema=schema,
         use_cache=use_cache,
         cache_ttl=cache_ttl,
         connection_string=connection_string
     )
+    schema_data = scan['schema']
+    foreign_keys = scan['foreign_keys']
+    many_to_many = scan['many_to_many']
+    relationship_graph = scan['graph']
 
     tables_found = schema_data['table_count']
     logger.info(f"✓ Found {tables_found} tables")
-
-    # Step 2: Analyze relationships
-    logger.info("")
-    logger.info("[2/3] Analyzing table relationships...")
-    foreign_keys = get_foreign_keys(conn, schema)
-    many_to_many = detect_many_to_many(conn, schema)
-    relationship_graph = build_relationship_graph(conn, schema)
-
     logger.info(f"✓ Found {len(foreign_keys)} foreign key relationships")
     logger.info(f"✓ Detected {len(many_to_many)} many-to-many relationships")
 
-    # Step 3: Build context
+    # Step 2: Build context
     logger.info("")
-    logger.info("[3/3] Building database context...")
+    logger.info("[2/2] Building database context...")
 
     context = {
         'connection_info': {
@@ -128,6 +255,7 @@ def initialize_database(
         'schema': schema_data,
         'relationships': {
             'foreign_keys': foreign_keys,
+            'fk_by_table': group_foreign_keys_by_table(foreign_keys),
             'many_to_many': many_to_many,
             'graph': relationship_graph
         },
@@ -140,9 +268,10 @@ def initialize_database(
     }
 
     # Save context
+    # Compact JSON at the fastest gzip level: small on disk, cheap to write
     context_path = get_db_context_path(connection_string)
-    with open(context_path, 'w') as f:
-        json.dump(context, f, indent=2, default=str)
+    with gzip.open(context_path, 'wb', compresslevel=1) as f:
+        f.write(dumps_json(context, indent=False))
 
     logger.info(f"✓ Context saved to: {context_path}")
 
@@ -159,27 +288,50 @@ def initialize_database(
     return context
 
 
+@functools.lru_cache(maxsize=8)
+def _load_context_file(context_path: str, mtime_ns: int) -> Optional[Dict]:
+    """
+    Read and parse a context file, memoized per file modification time
+
+    Args:
+        context_path: Path to context file
+        mtime_ns: File modification time (only used as part of the cache key)
+
+    Returns:
+        Database context or None if the file cannot be parsed
+    """
+    try:
+        if context_path.endswith('.gz'):
+            with gzip.open(context_path, 'rb') as f:
+                data = f.read()
+        else:
+            with open(context_path, 'rb') as f:
+                data = f.read()
+        return loads_json(data)
+    except Exception as e:
+        logger.warning(f"Failed to load context: {e}")
+        return None
+
+
 def load_database_context(connection_string: str) -> Optional[Dict]:
     """
     Load previously initialized database context
 
+    Repeated loads in the same process reuse the parsed context until the
+    file changes on disk. The returned dictionary is shared between calls,
+    so copy it before modifying.
+
     Args:
         connection_string: Database connection string
 
     Returns:
         Database context or None if not found
     """
-    context_path = get_db_context_path(connection_string)
-
-    if not os.path.exists(context_path):
+    found = find_context_file(connection_string)
+    if found is None:
         return None
 
-    try:
-        with open(context_path, 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        logger.warning(f"Failed to load context: {e}")
-        return None
+    return _load_context_file(*found)
 
 
 def format_context_summary(context: Dict) -> str:
@@ -213,14 +365,12 @@ def format_context_summary(context: Dict) -> str:
 
     # Tables
     lines.append("## Available Tables")
+    tables_by_name = {t['name']: t for t in context['schema']['tables']}
     for table_name in summary['tables']:
-        # Find table details
-        table_data = next(
-            (t for t in context['schema']['tables'] if t['name'] == table_name),
-            None
-        )
+        table_data = tables_by_name.get(table_name)
         if table_data:
-            row_count = table_data.get('row_count_estimate', 0)
+            # Views have no row count estimate
+            row_count = table_data.get('row_count_estimate') or 0
             col_count = len(table_data.get('columns', []))
             lines.append(f"- **{table_name}** ({col_count} columns, ~{row_count:,} rows)")
 
@@ -230,13 +380,12 @@ def format_context_summary(context: Dict) -> str:
     if context['relationships']['foreign_keys']:
         lines.append("## Key Relationships")
 
-        # Group by source table
-        from collections import defaultdict
-        by_table = defaultdict(list)
-        for fk in context['relationships']['foreign_keys']:
-            by_table[fk['from_table']].append(fk)
+        # Grouped at init time; contexts saved by older versions lack it
+        by_table = context['relationships'].get('fk_by_table')
+        if by_table is None:
+            by_table = group_foreign_keys_by_table(context['relationships']['foreign_keys'])
 
-        for table_name in sorted(by_table.keys())[:5]:  # Show first 5
+        for table_name in heapq.nsmallest(5, by_table):  # Show first 5
             lines.append(f"### {table_name}")
             for fk in by_table[table_name][:3]:  # Show first 3 FKs per table
                 lines.append(f"- `{fk['from_column']}` → `{fk['to_table']}.{fk['to_column']}`")
@@ -259,6 +408,41 @@ def format_context_summary(context: Dict) -> str:
     return '\n'.join(lines)
 
 
+def get_context_summary(connection_string: str, context: Dict) -> str:
+    """
+    Get context summary, reusing the rendered file while it is up to date
+
+    The summary is re-rendered whenever the context file is newer than the
+    saved summary.
+
+    Args:
+        connection_string: Database connection string
+        context: Database context dictionary
+
+    Returns:
+        Formatted markdown string
+    """
+    found = find_context_file(connection_string)
+    summary_path = get_summary_path(connection_string)
+
+    try:
+        if found is not None and os.stat(summary_path).st_mtime_ns >= found[1]:
+            with open(summary_path, 'r', encoding='utf-8') as f:
+                return f.read()
+    except OSError:
+        pass
+
+    summary = format_context_summary(context)
+
+    try:
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(summary)
+    except OSError as e:
+        logger.warning(f"Failed to save summary: {e}")
+
+    return summary
+
+
 def main():
     """Main entry point for database initialization"""
     parser = argparse.ArgumentParser(
@@ -342,7 +526,7 @@ Examples:
             if not context:
                 print("No existing context found. Run without --load to initialize.")
                 return 1
-            print(f"Loaded context from: {get_db_context_path(args.connection_string)}")
+            print(f"Loaded context from: {find_context_file(args.connection_string)[0]}")
         else:
             # Initialize database
             context = initialize_database(
@@ -354,9 +538,9 @@ Examples:
 
         # Output results
         if args.output_format == 'json':
-            print(json.dumps(context, indent=2, default=str))
+            print(dumps_json(context).decode('utf-8'))
         else:
-            print(format_context_summary(context))
+            print(get_context_summary(args.connection_string, context))
 
         return 0
 
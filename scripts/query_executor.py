@@ -5,17 +5,24 @@ Safely executes SQL queries with formatted output
 """
 
 import argparse
+import atexit
 import csv
+import functools
 import io
 import json
 import logging
+import os
+import re
 import sys
 import time
-from typing import Any, Dict, List, Optional
+from contextlib import closing, contextmanager
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 from urllib.parse import urlparse
 
 try:
     import psycopg
+    from psycopg.conninfo import conninfo_to_dict, make_conninfo
+    from psycopg.rows import tuple_row
 except ImportError:
     print("Error: psycopg library not found. Please install it:")
     print("  pip install 'psycopg[binary]'")
@@ -28,6 +35,16 @@ except ImportError:
     print("  pip install tabulate")
     sys.exit(1)
 
+# psycopg_pool is optional: it lets library callers reuse connections
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError:
+    ConnectionPool = None
+
+# Shared JSON helpers; orjson is optional and imported by schema_scanner
+sys.path.insert(0, os.path.dirname(__file__))
+from schema_scanner import dumps_json, orjson
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,7 +52,51 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Leading keywords of statements that modify data or schema. Matching only
+# the start of the string avoids copying and upper-casing the whole query.
+MODIFICATION_QUERY_RE = re.compile(
+    r'\s*(?:INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|TRUNCATE|GRANT|REVOKE)\b',
+    re.IGNORECASE
+)
+
+# Statements that can be run on a server-side cursor (DECLARE ... CURSOR FOR)
+STREAMABLE_QUERY_RE = re.compile(r'\s*(?:SELECT|WITH|VALUES|TABLE)\b', re.IGNORECASE)
+
+# Converters for column types JSON has no native form for, keyed by type
+# OID. Applying them per column up front means stdlib json never has to
+# fall back to its per-value default=str hook; str() keeps the output unchanged.
+JSON_ADAPTERS: Dict[int, Callable[[Any], Any]] = {
+    psycopg.postgres.types[name].oid: str
+    for name in (
+        'numeric', 'money', 'date', 'time', 'timetz', 'timestamp',
+        'timestamptz', 'interval', 'uuid', 'inet', 'cidr', 'bytea'
+    )
+}
+
+# Server option that makes every transaction on a session read-only
+READ_ONLY_OPTION = '-c default_transaction_read_only=on'
+
+# Trailing semicolons, which cannot appear inside COPY (...)
+TRAILING_SEMICOLON_RE = re.compile(r'[\s;]+$')
 
+# Rows fetched per round-trip when streaming from a server-side cursor
+STREAM_ITERSIZE = 500
+
+# Rows per message when streaming a client-side result; libpq 17 added
+# chunked mode and psycopg 3.2 the stream(size=...) argument to use it, older
+# versions send one row per message
+STREAM_CHUNK_SIZE = (
+    STREAM_ITERSIZE
+    if psycopg.pq.version() >= 170000 and tuple(map(int, psycopg.__version__.split('.')[:2])) >= (3, 2)
+    else 1
+)
+
+# Connection pools reused across calls in this process,
+# keyed by (connection string, read-only flag)
+_POOL_CACHE: Dict[Tuple[str, bool], 'ConnectionPool'] = {}
+
+
+@functools.lru_cache(maxsize=32)
 def mask_connection_string(conn_str: str) -> str:
     """Mask password in connection string for safe display"""
     try:
@@ -47,6 +108,23 @@ def mask_connection_string(conn_str: str) -> str:
         return "***connection string***"
 
 
+def read_only_conninfo(connection_string: str) -> str:
+    """
+    Add the read-only server option to a connection string
+
+    Options already set in the connection string (or PGOPTIONS, which an
+    explicit options parameter would otherwise override) are kept.
+
+    Args:
+        connection_string: PostgreSQL connection string
+
+    Returns:
+        Connection string whose sessions start read-only
+    """
+    options = conninfo_to_dict(connection_string).get('options') or os.environ.get('PGOPTIONS', '')
+    return make_conninfo(connection_string, options=f"{options} {READ_ONLY_OPTION}".strip())
+
+
 def connect_to_database(connection_string: str, read_only: bool = True) -> psycopg.Connection:
     """
     Establish connection to PostgreSQL database
@@ -60,13 +138,14 @@ def connect_to_database(connection_string: str, read_only: bool = True) -> psyco
     """
     try:
         logger.info(f"Connecting to database: {mask_connection_string(connection_string)}")
-        conn = psycopg.connect(connection_string)
 
-        # Set read-only mode if requested
+        # Read-only mode is a startup option, so the server enforces it from
+        # the first statement without a follow-up SET
         if read_only:
-            conn.read_only = True
+            conn = psycopg.connect(read_only_conninfo(connection_string))
             logger.info("Connection opened in READ-ONLY mode")
         else:
+            conn = psycopg.connect(connection_string)
             logger.warning("Connection opened in READ-WRITE mode")
 
         return conn
@@ -75,6 +154,81 @@ def connect_to_database(connection_string: str, read_only: bool = True) -> psyco
         raise
 
 
+def get_connection_pool(connection_string: str, read_only: bool = True) -> Optional['ConnectionPool']:
+    """
+    Get the process-wide connection pool for a connection string
+
+    Args:
+        connection_string: PostgreSQL connection string
+        read_only: Whether pooled connections are read-only (default: True)
+
+    Returns:
+        Connection pool, or None if psycopg_pool is not installed
+    """
+    if ConnectionPool is None:
+        return None
+
+    key = (connection_string, read_only)
+    pool = _POOL_CACHE.get(key)
+
+    if pool is None:
+        def configure(conn: psycopg.Connection) -> None:
+            # Pooled sessions outlive a single query, which could reset the
+            # session default; BEGIN READ ONLY keeps each transaction safe
+            conn.read_only = read_only
+
+        logger.info(f"Opening connection pool: {mask_connection_string(connection_string)}")
+        pool = ConnectionPool(
+            read_only_conninfo(connection_string) if read_only else connection_string,
+            min_size=1,
+            max_size=4,
+            configure=configure,
+            open=True
+        )
+        _POOL_CACHE[key] = pool
+
+    return pool
+
+
+def close_connection_pools() -> None:
+    """Close all connection pools opened by get_connection_pool()"""
+    while _POOL_CACHE:
+        _, pool = _POOL_CACHE.popitem()
+        pool.close()
+
+
+atexit.register(close_connection_pools)
+
+
+@contextmanager
+def pooled_connection(connection_string: str, read_only: bool = True) -> Iterator[psycopg.Connection]:
+    """
+    Borrow a connection from the process-wide pool
+
+    Falls back to a dedicated connection that is closed on exit when
+    psycopg_pool is not installed.
+
+    Args:
+        connection_string: PostgreSQL connection string
+        read_only: Whether the connection is read-only (default: True)
+
+    Yields:
+        Database connection
+    """
+    pool = get_connection_pool(connection_string, read_only)
+
+    if pool is None:
+        conn = connect_to_database(connection_string, read_only=read_only)
+        try:
+            yield conn
+        finally:
+            conn.close()
+        return
+
+    with pool.connection() as conn:
+        yield conn
+
+
 def is_modification_query(sql: str) -> bool:
     """
     Check if SQL query modifies data
@@ -85,14 +239,96 @@ def is_modification_query(sql: str) -> bool:
     Returns:
         True if query modifies data (INSERT, UPDATE, DELETE, etc.)
     """
-    sql_upper = sql.strip().upper()
-    modification_keywords = ['INSERT', 'UPDATE', 'DELETE', 'DROP', 'CREATE', 'ALTER', 'TRUNCATE']
+    return MODIFICATION_QUERY_RE.match(sql) is not None
+
+
+def fetch_results(cur: psycopg.Cursor, result: Dict, max_rows: int) -> None:
+    """
+    Fill a query results dictionary from an executed cursor
+
+    Args:
+        cur: Cursor the query was executed on
+        result: Query results dictionary to update
+        max_rows: Maximum number of rows to keep
+    """
+    # Check if query returns results
+    if cur.description:
+        # SELECT query - fetch results
+        column_names = [desc[0] for desc in cur.description]
+        result['columns'] = column_names
+        result['column_types'] = [desc.type_code for desc in cur.description]
+
+        # Fetch rows with limit
+        rows = cur.fetchmany(max_rows + 1)
+
+        # Check if results were truncated
+        if len(rows) > max_rows:
+            result['truncated'] = True
+            rows = rows[:max_rows]
+
+        # Keep rows as tuples; formatters pair them with 'columns'
+        result['rows'] = rows
+        result['row_count'] = len(rows)
+
+    else:
+        # INSERT/UPDATE/DELETE query - get affected rows
+        result['row_count'] = cur.rowcount if cur.rowcount >= 0 else 0
+
+
+def is_read_only_session(conn: psycopg.Connection) -> bool:
+    """
+    Check if every transaction on a connection is read-only
+
+    Args:
+        conn: Database connection
+
+    Returns:
+        True if psycopg starts read-only transactions or the server reports
+        default_transaction_read_only=on (PostgreSQL 14+)
+    """
+    return bool(conn.read_only) or conn.info.parameter_status('default_transaction_read_only') == 'on'
 
-    for keyword in modification_keywords:
-        if sql_upper.startswith(keyword):
-            return True
 
-    return False
+def stream_results(
+    cur: psycopg.Cursor,
+    sql: str,
+    params: Optional[Dict],
+    result: Dict,
+    max_rows: int
+) -> None:
+    """
+    Fill a query results dictionary by streaming rows from the server
+
+    Unlike fetch_results(), rows past max_rows + 1 are never transferred:
+    the query is cancelled as soon as truncation is detected. Cancelling
+    aborts the transaction, so only use this on read-only sessions.
+
+    Args:
+        cur: Cursor to run the query on
+        sql: Single read query
+        params: Query parameters for parameterized queries
+        result: Query results dictionary to update
+        max_rows: Maximum number of rows to keep
+    """
+    rows = []
+
+    # psycopg 3.1 has no size argument; one row per message is its only mode
+    stream_options = {'size': STREAM_CHUNK_SIZE} if STREAM_CHUNK_SIZE > 1 else {}
+
+    with closing(cur.stream(sql, params or None, **stream_options)) as stream:
+        for row in stream:
+            if len(rows) == max_rows:
+                result['truncated'] = True
+                break
+            rows.append(row)
+
+    # Not available for empty results, which produce no row messages
+    if cur.description:
+        result['columns'] = [desc[0] for desc in cur.description]
+        result['column_types'] = [desc.type_code for desc in cur.description]
+
+    result['rows'] = rows
+    result['row_count'] = len(rows)
 
 
 def execute_query(
@@ -114,9 +350,10 @@ def execute_query(
         Dictionary with query results:
         {
             'success': bool,
-            'rows': List[Dict] or None,
+            'rows': List[tuple] or None,
             'row_count': int,
-            'columns': List[str],
+            'columns': List[str],  # shared by all rows, in row order
+            'column_types': List[int],  # type OIDs, only set for row results
             'execution_time_ms': float,
             'truncated': bool,
             'error': str or None
@@ -135,49 +372,285 @@ def execute_query(
     }
 
     try:
-        with conn.cursor() as cur:
-            # Execute query
-            if params:
-                cur.execute(sql, params)
+        # tuple_row is psycopg's C fast path; pin it so a connection-level
+        # row_factory (e.g. dict_row) cannot change the shape of 'rows'
+        with conn.cursor(row_factory=tuple_row) as cur:
+            # Streaming uses the extended protocol, which takes one statement
+            if (is_streamable_query(sql) and ';' not in TRAILING_SEMICOLON_RE.sub('', sql)
+                    and is_read_only_session(conn)):
+                stream_results(cur, sql, params, result, max_rows)
+
             else:
-                cur.execute(sql)
+                # Execute query
+                if params:
+                    cur.execute(sql, params)
+                else:
+                    cur.execute(sql)
 
-            # Check if query returns results
-            if cur.description:
-                # SELECT query - fetch results
-                column_names = [desc[0] for desc in cur.description]
-                result['columns'] = column_names
+                fetch_results(cur, result, max_rows)
 
-                # Fetch rows with limit
-                rows = cur.fetchmany(max_rows + 1)
+            conn.commit()
+            result['success'] = True
 
-                # Check if results were truncated
-                if len(rows) > max_rows:
-                    result['truncated'] = True
-                    rows = rows[:max_rows]
+    except Exception as e:
+        conn.rollback()
+        result['error'] = str(e)
+        logger.error(f"Query execution failed: {e}")
 
-                # Convert to list of dictionaries
-                result['rows'] = [
-                    dict(zip(column_names, row))
-                    for row in rows
-                ]
-                result['row_count'] = len(result['rows'])
+    finally:
+        execution_time = (time.time() - start_time) * 1000
+        result['execution_time_ms'] = execution_time
+
+    return result
+
+
+def is_streamable_query(sql: str) -> bool:
+    """
+    Check if SQL query can be streamed from a server-side cursor
+
+    Args:
+        sql: SQL query
+
+    Returns:
+        True for row-returning read queries (SELECT, WITH, VALUES, TABLE)
+    """
+    return STREAMABLE_QUERY_RE.match(sql) is not None
 
-            else:
-                # INSERT/UPDATE/DELETE query - get affected rows
-                result['row_count'] = cur.rowcount if cur.rowcount >= 0 else 0
 
+def execute_query_streaming(
+    conn: psycopg.Connection,
+    sql: str,
+    params: Optional[Dict] = None,
+    max_rows: int = 1000
+) -> Dict:
+    """
+    Execute a read query on a server-side cursor without materializing rows
+
+    Rows are pulled from the server STREAM_ITERSIZE at a time as the caller
+    iterates, so memory stays bounded regardless of result size.
+
+    Args:
+        conn: Database connection
+        sql: SQL query (must be streamable, see is_streamable_query())
+        params: Query parameters for parameterized queries
+        max_rows: Maximum number of rows to return (default: 1000)
+
+    Returns:
+        Same dictionary as execute_query(), except 'rows' is an iterator of
+        tuples. 'row_count', 'truncated' and 'execution_time_ms' are final
+        once the iterator is exhausted; a failure while fetching sets
+        'success' to False and 'error'.
+    """
+    start_time = time.time()
+
+    result = {
+        'success': False,
+        'rows': None,
+        'row_count': 0,
+        'columns': [],
+        'execution_time_ms': 0,
+        'truncated': False,
+        'error': None
+    }
+
+    cur = conn.cursor(name='text2sql_stream', row_factory=tuple_row)
+    cur.itersize = STREAM_ITERSIZE
+
+    try:
+        cur.execute(sql, params)
+        result['columns'] = [desc[0] for desc in cur.description]
+        result['column_types'] = [desc.type_code for desc in cur.description]
+    except Exception as e:
+        # DECLARE only parses and plans, so retrying on a regular cursor
+        # is cheap and reports errors against the original statement
+        logger.debug(f"Streaming not possible, falling back: {e}")
+        cur.close()
+        conn.rollback()
+        return execute_query(conn, sql, params, max_rows)
+
+    def iter_rows():
+        try:
+            for row in cur:
+                if result['row_count'] >= max_rows:
+                    result['truncated'] = True
+                    break
+                result['row_count'] += 1
+                yield row
+            cur.close()
             conn.commit()
-            result['success'] = True
+        except Exception as e:
+            cur.close()
+            conn.rollback()
+            result['success'] = False
+            result['error'] = str(e)
+            logger.error(f"Query execution failed: {e}")
+        finally:
+            result['execution_time_ms'] = (time.time() - start_time) * 1000
+
+    result['rows'] = iter_rows()
+    result['success'] = True
+
+    return result
+
+
+def adapt_rows_for_json(results: Dict, rows: Iterable[tuple]) -> Iterable[tuple]:
+    """
+    Convert values JSON has no native type for, one column at a time
+
+    Only columns with an entry in JSON_ADAPTERS are touched. orjson
+    already converts those values in C through its default hook, faster
+    than a Python pass over the rows, so rows are passed through unchanged
+    when it is installed.
+
+    Args:
+        results: Query results dictionary (for 'column_types')
+        rows: Result rows
+
+    Returns:
+        Rows ready for JSON serialization
+    """
+    if orjson is not None:
+        return rows
+
+    adapters = [
+        (i, JSON_ADAPTERS[type_code])
+        for i, type_code in enumerate(results.get('column_types') or ())
+        if type_code in JSON_ADAPTERS
+    ]
+    if not adapters:
+        return rows
+
+    def adapt(row: tuple) -> tuple:
+        values = list(row)
+        for i, adapter in adapters:
+            if values[i] is not None:
+                values[i] = adapter(values[i])
+        return tuple(values)
+
+    return map(adapt, rows)
+
+
+def rows_as_dicts(results: Dict) -> List[Dict]:
+    """
+    Pair result rows with column names, ready for JSON serialization
+
+    Args:
+        results: Query results dictionary
+
+    Returns:
+        List of row dictionaries keyed by column name
+    """
+    columns = results['columns']
+    rows = adapt_rows_for_json(results, results['rows'] or ())
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def text_column_indices(results: Dict) -> List[int]:
+    """
+    Find the columns that hold strings
+
+    tabulate tries to parse every cell as a number to decide alignment;
+    numbers already arrive typed from psycopg, so string columns can skip
+    that work (and are no longer right-aligned when they look numeric).
+
+    Args:
+        results: Query results dictionary
+
+    Returns:
+        Indices of string columns, for tabulate's disable_numparse
+    """
+    rows = results['rows'] or ()
+    indices = []
+
+    for i in range(len(results['columns'])):
+        # The first non-NULL value decides the column type
+        value = next((row[i] for row in rows if row[i] is not None), None)
+        if isinstance(value, str):
+            indices.append(i)
+
+    return indices
+
+
+def execute_query_copy_csv(
+    conn: psycopg.Connection,
+    sql: str,
+    params: Optional[Dict] = None,
+    max_rows: int = 1000,
+    out: Optional[BinaryIO] = None
+) -> Optional[Dict]:
+    """
+    Export query results as CSV generated by PostgreSQL's COPY
+
+    The server formats the CSV and the bytes are written to the output
+    as they arrive, so no rows are built in Python. The header row is
+    always written, even for empty results. COPY sends each row in its own
+    message, so rows are counted without parsing the CSV; one row past
+    max_rows is requested to detect truncation and is not written.
+
+    Args:
+        conn: Database connection
+        sql: SQL query (must be streamable, see is_streamable_query())
+        params: Query parameters for parameterized queries
+        max_rows: Maximum number of rows to export (default: 1000)
+        out: Binary stream to write to (default: sys.stdout.buffer)
+
+    Returns:
+        Query results dictionary without rows, or None if the query could
+        not be wrapped in COPY and nothing was written (the caller should
+        fall back to another execution path)
+    """
+    if out is None:
+        out = sys.stdout.buffer
+
+    start_time = time.time()
+
+    result = {
+        'success': False,
+        'rows': None,
+        'row_count': 0,
+        'columns': [],
+        'execution_time_ms': 0,
+        'truncated': False,
+        'error': None
+    }
+
+    # Keep the query on its own lines so a trailing comment cannot swallow
+    # the closing parenthesis
+    body = TRAILING_SEMICOLON_RE.sub('', sql)
+    copy_sql = (
+        f"COPY (SELECT * FROM (\n{body}\n) AS text2sql_query LIMIT {int(max_rows) + 1})"
+        " TO STDOUT WITH (FORMAT CSV, HEADER)"
+    )
+
+    written = False
+    try:
+        with conn.cursor() as cur:
+            with cur.copy(copy_sql, params) as copy:
+                for chunk in copy:
+                    if not written:
+                        header = bytes(chunk).decode(conn.info.encoding)
+                        result['columns'] = next(csv.reader(io.StringIO(header)), [])
+                    elif result['row_count'] == max_rows:
+                        result['truncated'] = True
+                        continue
+                    else:
+                        result['row_count'] += 1
+                    out.write(chunk)
+                    written = True
+        out.flush()
+        conn.commit()
+        result['success'] = True
 
     except Exception as e:
         conn.rollback()
+        if not written:
+            logger.debug(f"COPY export not possible, falling back: {e}")
+            return None
         result['error'] = str(e)
         logger.error(f"Query execution failed: {e}")
 
     finally:
-        execution_time = (time.time() - start_time) * 1000
-        result['execution_time_ms'] = execution_time
+        result['execution_time_ms'] = (time.time() - start_time) * 1000
 
     return result
 
@@ -201,10 +674,11 @@ def format_results_table(results: Dict) -> str:
     # Create table
     table = tabulate(
         results['rows'],
-        headers='keys',
+        headers=results['columns'],
         tablefmt='grid',
         numalign='right',
-        stralign='left'
+        stralign='left',
+        disable_numparse=text_column_indices(results)
     )
 
     output = [table]
@@ -238,13 +712,13 @@ def format_results_json(results: Dict) -> str:
     }
 
     if results['success']:
-        output['data'] = results['rows']
+        output['data'] = rows_as_dicts(results)
         output['row_count'] = results['row_count']
         output['truncated'] = results['truncated']
     else:
         output['error'] = results['error']
 
-    return json.dumps(output, indent=2, default=str)
+    return dumps_json(output).decode('utf-8')
 
 
 def format_results_csv(results: Dict) -> str:
@@ -265,15 +739,76 @@ def format_results_csv(results: Dict) -> str:
 
     # Create CSV
     output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=results['columns'])
+    writer = csv.writer(output)
 
-    writer.writeheader()
-    for row in results['rows']:
-        writer.writerow(row)
+    writer.writerow(results['columns'])
+    writer.writerows(results['rows'])
 
     return output.getvalue()
 
 
+def write_results_csv(results: Dict, out: TextIO) -> None:
+    """
+    Write results as CSV, consuming rows as they are fetched
+
+    Args:
+        results: Query results dictionary (rows may be an iterator of tuples)
+        out: Text stream to write to
+    """
+    if not results['success']:
+        out.write(f"Error: {results['error']}\n")
+        return
+
+    rows = iter(results['rows'] or ())
+    first_row = next(rows, None)
+
+    if first_row is not None:
+        writer = csv.writer(out)
+        writer.writerow(results['columns'])
+        writer.writerow(first_row)
+        writer.writerows(rows)
+
+    out.write("\n")
+
+
+def write_results_json(results: Dict, out: TextIO) -> None:
+    """
+    Write results as JSON, serializing one row at a time as rows are fetched
+
+    Status fields are written after the data since they are only final once
+    all rows have been consumed.
+
+    Args:
+        results: Query results dictionary (rows may be an iterator of tuples)
+        out: Text stream to write to
+    """
+    if not results['success']:
+        out.write(format_results_json(results) + "\n")
+        return
+
+    columns = results['columns']
+
+    out.write('{\n  "data": [')
+    separator = '\n'
+    for row in adapt_rows_for_json(results, results['rows']):
+        out.write(separator + '    ' + dumps_json(dict(zip(columns, row)), indent=False).decode('utf-8'))
+        separator = ',\n'
+    out.write('\n  ]' if separator != '\n' else ']')
+
+    status = {
+        'success': results['success'],
+        'execution_time_ms': results['execution_time_ms'],
+        'row_count': results['row_count'],
+        'truncated': results['truncated']
+    }
+    if not results['success']:
+        status['error'] = results['error']
+
+    for key, value in status.items():
+        out.write(f',\n  "{key}": {dumps_json(value, indent=False).decode("utf-8")}')
+    out.write('\n}\n')
+
+
 def format_results_markdown(results: Dict) -> str:
     """
     Format results as Markdown table
@@ -293,10 +828,11 @@ def format_results_markdown(results: Dict) -> str:
     # Create markdown table
     table = tabulate(
         results['rows'],
-        headers='keys',
+        headers=results['columns'],
         tablefmt='github',
         numalign='right',
-        stralign='left'
+        stralign='left',
+        disable_numparse=text_column_indices(results)
     )
 
     output = [table]
@@ -316,7 +852,11 @@ def execute_with_explain(
     analyze: bool = False
 ) -> Dict:
     """
-    Execute query with EXPLAIN ANALYZE
+    Execute query with EXPLAIN or EXPLAIN ANALYZE
+
+    Without analyze, EXPLAIN and the query are sent in one pipeline when
+    libpq supports it, so the plan costs no extra round trip. With analyze,
+    only EXPLAIN ANALYZE runs and no rows are returned.
 
     Args:
         conn: Database connection
@@ -335,7 +875,11 @@ def execute_with_explain(
     explain_sql = f"{explain_cmd} {sql}"
 
     try:
-        with conn.cursor() as cur:
+        if not analyze and psycopg.Pipeline.is_supported():
+            # Send EXPLAIN and the query together: one round trip, not two
+            return _execute_with_explain_pipelined(conn, sql, explain_sql, params)
+
+        with conn.cursor(row_factory=tuple_row) as cur:
             if params:
                 cur.execute(explain_sql, params)
             else:
@@ -370,6 +914,70 @@ def execute_with_explain(
         }
 
 
+def _execute_with_explain_pipelined(
+    conn: psycopg.Connection,
+    sql: str,
+    explain_sql: str,
+    params: Optional[Dict] = None,
+    max_rows: int = 1000
+) -> Dict:
+    """
+    Run EXPLAIN and the query in a single pipeline (see execute_with_explain)
+    """
+    start_time = time.time()
+
+    query_result = {
+        'success': False,
+        'rows': None,
+        'row_count': 0,
+        'columns': [],
+        'execution_time_ms': 0,
+        'truncated': False,
+        'error': None
+    }
+
+    with conn.cursor(row_factory=tuple_row) as explain_cur, \
+            conn.cursor(row_factory=tuple_row) as query_cur:
+        try:
+            with conn.pipeline() as pipeline:
+                if params:
+                    explain_cur.execute(explain_sql, params)
+                    query_cur.execute(sql, params)
+                else:
+                    explain_cur.execute(explain_sql)
+                    query_cur.execute(sql)
+
+                # Sync explicitly so errors surface here rather than while
+                # the pipeline is being torn down
+                pipeline.sync()
+
+            fetch_results(query_cur, query_result, max_rows)
+            conn.commit()
+            query_result['success'] = True
+
+        except Exception as e:
+            conn.rollback()
+
+            # The pipeline raises the first error; if EXPLAIN itself failed
+            # there is no plan to report
+            if explain_cur.description is None:
+                raise
+
+            query_result['error'] = str(e)
+            logger.error(f"Query execution failed: {e}")
+
+        finally:
+            query_result['execution_time_ms'] = (time.time() - start_time) * 1000
+
+        explain_result = explain_cur.fetchone()[0]
+
+    return {
+        'success': True,
+        'query_result': query_result,
+        'explain': explain_result[0]
+    }
+
+
 def execute_safe(
     conn: psycopg.Connection,
     sql: str,
@@ -405,6 +1013,33 @@ def execute_safe(
     return execute_query(conn, sql, params, max_rows)
 
 
+def execute_pooled(
+    connection_string: str,
+    sql: str,
+    params: Optional[Dict] = None,
+    max_rows: int = 1000,
+    allow_writes: bool = False
+) -> Dict:
+    """
+    Execute query with safety checks on a pooled connection
+
+    Intended for callers that run many queries in one process; connection
+    setup is paid once per pool instead of once per query.
+
+    Args:
+        connection_string: PostgreSQL connection string
+        sql: SQL query
+        params: Query parameters
+        max_rows: Maximum rows to return
+        allow_writes: Whether to allow modification queries
+
+    Returns:
+        Query results dictionary
+    """
+    with pooled_connection(connection_string, read_only=not allow_writes) as conn:
+        return execute_safe(conn, sql, params, max_rows, allow_writes)
+
+
 def main():
     """Main entry point for query executor"""
     parser = argparse.ArgumentParser(
@@ -528,7 +1163,9 @@ Examples:
                 if args.format == 'table':
                     output = format_results_table(result['query_result'])
                 elif args.format == 'json':
-                    output = json.dumps(result, indent=2, default=str)
+                    query_result = {**result['query_result'], 'rows': rows_as_dicts(result['query_result'])}
+                    query_result.pop('column_types', None)
+                    output = dumps_json({**result, 'query_result': query_result}).decode('utf-8')
                 elif args.format == 'csv':
                     output = format_results_csv(result['query_result'])
                 else:  # markdown
@@ -549,6 +1186,26 @@ Examples:
                 print(f"Error: {result['error']}")
                 return 1
 
+        elif args.format in ('csv', 'json') and is_streamable_query(sql):
+            result = None
+
+            # Let PostgreSQL produce the CSV and pass the bytes through
+            if args.format == 'csv':
+                sys.stdout.flush()
+                result = execute_query_copy_csv(conn, sql, params, args.limit, sys.stdout.buffer)
+
+            if result is None:
+                # Stream rows straight from a server-side cursor to stdout
+                result = execute_query_streaming(conn, sql, params, args.limit)
+
+                if args.format == 'csv':
+                    write_results_csv(result, sys.stdout)
+                else:
+                    write_results_json(result, sys.stdout)
+            elif not result['success']:
+                # The CSV written so far is on stdout; keep the error off it
+                print(f"Error: {result['error']}", file=sys.stderr)
+
         else:
             result = execute_safe(conn, sql, params, args.limit, args.allow_writes)
 
@@ -5,15 +5,21 @@ Detects and analyzes table relationships for intelligent JOIN generation
 """
 
 import argparse
+import asyncio
+import functools
+import hashlib
 import json
 import logging
+import os
 import sys
-from collections import defaultdict, deque
-from typing import Dict, List, Optional, Tuple
+from array import array
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 from urllib.parse import urlparse
 
 try:
     import psycopg
+    from psycopg.rows import dict_row
 except ImportError:
     print("Error: psycopg library not found. Please install it:")
     print("  pip install 'psycopg[binary]'")
@@ -26,7 +32,130 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Cheap fingerprint of everything the relationship graph is derived from:
+# foreign key definitions and per-table column counts (used by junction
+# table detection). A changed fingerprint invalidates cached graphs.
+SCHEMA_FINGERPRINT_QUERY = """
+    SELECT md5(concat_ws('|',
+        (SELECT string_agg(
+                    con.conrelid::regclass::text || '.' || con.conname || ':' ||
+                    pg_get_constraintdef(con.oid),
+                    ',' ORDER BY con.conrelid::regclass::text, con.conname)
+         FROM pg_constraint con
+         JOIN pg_namespace n ON n.oid = con.connamespace
+         WHERE con.contype = 'f' AND n.nspname = %s),
+        (SELECT string_agg(cl.relname || ':' || (
+                    SELECT count(*) FROM pg_attribute a
+                    WHERE a.attrelid = cl.oid AND a.attnum > 0 AND NOT a.attisdropped),
+                    ',' ORDER BY cl.relname)
+         FROM pg_class cl
+         JOIN pg_namespace n ON n.oid = cl.relnamespace
+         WHERE n.nspname = %s AND cl.relkind IN ('r', 'p', 'v', 'm', 'f'))
+    ))
+"""
+
+# Foreign key columns straight from pg_catalog. Key columns are paired by
+# position, so multi-column keys yield one row per column pair. Only keys
+# whose referenced table is in the same schema are listed.
+FOREIGN_KEYS_QUERY = """
+    SELECT
+        con.conname AS constraint_name,
+        cl.relname AS from_table,
+        att.attname AS from_column,
+        ref.relname AS to_table,
+        ref_att.attname AS to_column,
+        CASE con.confupdtype
+            WHEN 'a' THEN 'NO ACTION'
+            WHEN 'r' THEN 'RESTRICT'
+            WHEN 'c' THEN 'CASCADE'
+            WHEN 'n' THEN 'SET NULL'
+            WHEN 'd' THEN 'SET DEFAULT'
+        END AS on_update,
+        CASE con.confdeltype
+            WHEN 'a' THEN 'NO ACTION'
+            WHEN 'r' THEN 'RESTRICT'
+            WHEN 'c' THEN 'CASCADE'
+            WHEN 'n' THEN 'SET NULL'
+            WHEN 'd' THEN 'SET DEFAULT'
+        END AS on_delete
+    FROM pg_constraint con
+    JOIN pg_class cl ON cl.oid = con.conrelid
+    JOIN pg_namespace n ON n.oid = cl.relnamespace
+    JOIN pg_class ref ON ref.oid = con.confrelid AND ref.relnamespace = cl.relnamespace
+    CROSS JOIN LATERAL unnest(con.conkey, con.confkey) WITH ORDINALITY AS k(attnum, ref_attnum, position)
+    JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = k.attnum
+    JOIN pg_attribute ref_att ON ref_att.attrelid = con.confrelid AND ref_att.attnum = k.ref_attnum
+    WHERE con.contype = 'f'
+        AND n.nspname = %s
+    ORDER BY cl.relname, con.conname, k.position
+"""
+
+# Equivalent information_schema query (--compat-info-schema). Much slower
+# on large catalogs and only lists tables the current user has privileges
+# on; multi-column keys yield every column combination.
+INFO_SCHEMA_FOREIGN_KEYS_QUERY = """
+    SELECT
+        tc.constraint_name,
+        tc.table_name AS from_table,
+        kcu.column_name AS from_column,
+        ccu.table_name AS to_table,
+        ccu.column_name AS to_column,
+        rc.update_rule AS on_update,
+        rc.delete_rule AS on_delete
+    FROM information_schema.table_constraints AS tc
+    JOIN information_schema.key_column_usage AS kcu
+        ON tc.constraint_name = kcu.constraint_name
+        AND tc.table_schema = kcu.table_schema
+    JOIN information_schema.constraint_column_usage AS ccu
+        ON ccu.constraint_name = tc.constraint_name
+        AND ccu.table_schema = tc.table_schema
+    JOIN information_schema.referential_constraints AS rc
+        ON rc.constraint_name = tc.constraint_name
+        AND rc.constraint_schema = tc.table_schema
+    WHERE tc.constraint_type = 'FOREIGN KEY'
+        AND tc.table_schema = %s
+    ORDER BY tc.table_name, tc.constraint_name
+"""
+
+# Read foreign keys with INFO_SCHEMA_FOREIGN_KEYS_QUERY (--compat-info-schema)
+COMPAT_INFO_SCHEMA = False
+
+# First foreign key between two tables, in either direction; ordered like
+# the foreign keys query so it is the edge a graph search would take
+DIRECT_FK_QUERY = """
+    SELECT * FROM ({fk_query}) AS fk
+    WHERE (fk.from_table = %s AND fk.to_table = %s)
+        OR (fk.from_table = %s AND fk.to_table = %s)
+    ORDER BY fk.from_table, fk.constraint_name
+    LIMIT 1
+"""
+
+# Connections opened at once by build_graphs_for_schemas()
+MAX_SCHEMA_CONNECTIONS = 8
+
+# Rows fetched per round trip when streaming foreign keys
+FK_CURSOR_ITERSIZE = 2000
+
+COLUMN_COUNTS_QUERY = """
+    SELECT table_name, COUNT(*)
+    FROM information_schema.columns
+    WHERE table_schema = %s
+    GROUP BY table_name
+"""
+
+# In-process graph cache: (dsn, schema) -> (fingerprint, graph)
+_GRAPH_CACHE: Dict[Tuple[str, str], Tuple[str, 'RelationshipGraph']] = {}
 
+# Shortest paths remembered per graph
+PATH_CACHE_SIZE = 4096
+
+# Graphs with at least this many tables use the numba-compiled BFS when
+# numba is installed; importing numba costs more than a Python BFS on
+# smaller schemas
+JIT_MIN_TABLES = 20000
+
+
+@functools.lru_cache(maxsize=32)
 def mask_connection_string(conn_str: str) -> str:
     """Mask password in connection string for safe display"""
     try:
@@ -39,20 +168,49 @@ def mask_connection_string(conn_str: str) -> str:
 
 
 def connect_to_database(connection_string: str) -> psycopg.Connection:
-    """Establish connection to PostgreSQL database"""
+    """
+    Establish connection to PostgreSQL database
+
+    Queries are prepared server-side on first use (prepare_threshold=0), so
+    the catalog queries, which are module constants, are parsed and planned
+    once per connection however often they run.
+    """
     try:
         logger.info(f"Connecting to database: {mask_connection_string(connection_string)}")
-        conn = psycopg.connect(connection_string)
+        conn = psycopg.connect(connection_string, prepare_threshold=0)
         return conn
     except Exception as e:
         logger.error(f"Connection failed: {e}")
         raise
 
 
+def foreign_keys_query() -> str:
+    """Foreign keys query for the current catalog mode (see COMPAT_INFO_SCHEMA)"""
+    return INFO_SCHEMA_FOREIGN_KEYS_QUERY if COMPAT_INFO_SCHEMA else FOREIGN_KEYS_QUERY
+
+
+def interned_dict_row(cursor: psycopg.Cursor) -> Callable:
+    """
+    dict_row that interns string values
+
+    Table, column and constraint names repeat across foreign keys; interning
+    them keeps one string object per name instead of one per row.
+    """
+    make_row = dict_row(cursor)
+
+    def interned_row(values):
+        return make_row([sys.intern(v) if isinstance(v, str) else v for v in values])
+
+    return interned_row
+
+
 def get_foreign_keys(conn: psycopg.Connection, schema: str = 'public') -> List[Dict]:
     """
     Extract all foreign key relationships in schema
 
+    Rows are streamed through a server-side cursor, FK_CURSOR_ITERSIZE at a
+    time, so large schemas are never buffered whole on the client.
+
     Args:
         conn: Database connection
         schema: Schema name (default: 'public')
@@ -60,65 +218,59 @@ def get_foreign_keys(conn: psycopg.Connection, schema: str = 'public') -> List[D
     Returns:
         List of foreign key relationship dictionaries
     """
-    query = """
-        SELECT
-            tc.constraint_name,
-            tc.table_name,
-            kcu.column_name,
-            ccu.table_name AS foreign_table_name,
-            ccu.column_name AS foreign_column_name,
-            rc.update_rule,
-            rc.delete_rule
-        FROM information_schema.table_constraints AS tc
-        JOIN information_schema.key_column_usage AS kcu
-            ON tc.constraint_name = kcu.constraint_name
-            AND tc.table_schema = kcu.table_schema
-        JOIN information_schema.constraint_column_usage AS ccu
-            ON ccu.constraint_name = tc.constraint_name
-            AND ccu.table_schema = tc.table_schema
-        JOIN information_schema.referential_constraints AS rc
-            ON rc.constraint_name = tc.constraint_name
-        WHERE tc.constraint_type = 'FOREIGN KEY'
-            AND tc.table_schema = %s
-        ORDER BY tc.table_name, tc.constraint_name
-    """
-
-    foreign_keys = []
-    with conn.cursor() as cur:
-        cur.execute(query, (schema,))
-        for row in cur.fetchall():
-            constraint_name, table_name, column_name, foreign_table_name, foreign_column_name, update_rule, delete_rule = row
-            foreign_keys.append({
-                'constraint_name': constraint_name,
-                'from_table': table_name,
-                'from_column': column_name,
-                'to_table': foreign_table_name,
-                'to_column': foreign_column_name,
-                'on_update': update_rule,
-                'on_delete': delete_rule
-            })
+    # Outside a transaction (autocommit) a server-side cursor must be WITH HOLD
+    with conn.cursor(name='text2sql_fk', row_factory=interned_dict_row, withhold=conn.autocommit) as cur:
+        cur.itersize = FK_CURSOR_ITERSIZE
+        cur.execute(foreign_keys_query(), (schema,))
+        return list(cur)
 
-    return foreign_keys
 
-
-def detect_many_to_many(conn: psycopg.Connection, schema: str = 'public') -> List[Dict]:
+def _fetch_catalog_pipelined(
+    conn: psycopg.Connection,
+    schema: str = 'public'
+) -> Tuple[List[Dict], Dict[str, int]]:
     """
-    Identify junction tables indicating many-to-many relationships
+    Fetch foreign keys and per-table column counts in one round trip
 
-    A junction table typically:
-    - Has a composite primary key
-    - Has exactly 2 foreign keys
-    - May have only FK columns or a few additional columns
+    Both catalog queries are sent in a single pipeline; if libpq does not
+    support pipeline mode they run one after the other.
 
     Args:
         conn: Database connection
         schema: Schema name (default: 'public')
 
     Returns:
-        List of many-to-many relationship dictionaries
+        Tuple of (foreign keys, column count per table name)
+    """
+    with conn.cursor(row_factory=interned_dict_row) as fk_cur, conn.cursor() as count_cur:
+        if psycopg.Pipeline.is_supported():
+            with conn.pipeline():
+                fk_cur.execute(foreign_keys_query(), (schema,))
+                count_cur.execute(COLUMN_COUNTS_QUERY, (schema,))
+        else:
+            fk_cur.execute(foreign_keys_query(), (schema,))
+            count_cur.execute(COLUMN_COUNTS_QUERY, (schema,))
+
+        foreign_keys = fk_cur.fetchall()
+        column_counts = dict(count_cur.fetchall())
+
+    return foreign_keys, column_counts
+
+
+def detect_many_to_many_from(
+    foreign_keys: List[Dict],
+    column_counts: Dict[str, int]
+) -> List[Dict]:
     """
-    foreign_keys = get_foreign_keys(conn, schema)
+    Identify junction tables from already-fetched foreign keys
+
+    Args:
+        foreign_keys: Foreign keys from get_foreign_keys()
+        column_counts: Number of columns per table name
 
+    Returns:
+        List of many-to-many relationship dictionaries
+    """
     # Group foreign keys by table
     fk_by_table = defaultdict(list)
     for fk in foreign_keys:
@@ -128,92 +280,372 @@ def detect_many_to_many(conn: psycopg.Connection, schema: str = 'public') -> Lis
 
     for table_name, fks in fk_by_table.items():
         # Junction table typically has exactly 2 foreign keys
-        if len(fks) == 2:
-            # Check if table has minimal columns (mostly just FKs)
-            query = """
-                SELECT COUNT(*)
-                FROM information_schema.columns
-                WHERE table_schema = %s AND table_name = %s
-            """
-
-            with conn.cursor() as cur:
-                cur.execute(query, (schema, table_name))
-                column_count = cur.fetchone()[0]
-
-            # If column count is 2-4 (the 2 FKs plus maybe id and timestamp), likely a junction table
-            if column_count <= 4:
-                many_to_many.append({
-                    'junction_table': table_name,
-                    'table1': fks[0]['to_table'],
-                    'table1_column': fks[0]['to_column'],
-                    'table2': fks[1]['to_table'],
-                    'table2_column': fks[1]['to_column'],
-                    'junction_column1': fks[0]['from_column'],
-                    'junction_column2': fks[1]['from_column']
-                })
+        if len(fks) != 2:
+            continue
+
+        # If column count is 2-4 (the 2 FKs plus maybe id and timestamp), likely a junction table
+        column_count = column_counts.get(table_name)
+        if column_count is not None and column_count <= 4:
+            many_to_many.append({
+                'junction_table': table_name,
+                'table1': fks[0]['to_table'],
+                'table1_column': fks[0]['to_column'],
+                'table2': fks[1]['to_table'],
+                'table2_column': fks[1]['to_column'],
+                'junction_column1': fks[0]['from_column'],
+                'junction_column2': fks[1]['from_column']
+            })
 
     return many_to_many
 
 
-def build_relationship_graph(conn: psycopg.Connection, schema: str = 'public') -> Dict:
+def detect_many_to_many(conn: psycopg.Connection, schema: str = 'public') -> List[Dict]:
     """
-    Build a graph of all table relationships
+    Identify junction tables indicating many-to-many relationships
+
+    A junction table typically:
+    - Has a composite primary key
+    - Has exactly 2 foreign keys
+    - May have only FK columns or a few additional columns
 
     Args:
         conn: Database connection
         schema: Schema name (default: 'public')
 
     Returns:
-        Dictionary representing relationship graph:
-        {
-            'nodes': [table names],
-            'edges': [{from, to, columns}],
-            'foreign_keys': [fk details],
-            'many_to_many': [m2m details]
-        }
+        List of many-to-many relationship dictionaries
+    """
+    foreign_keys, column_counts = _fetch_catalog_pipelined(conn, schema)
+    return detect_many_to_many_from(foreign_keys, column_counts)
+
+
+class AdjacencyArrays:
+    """
+    Integer-indexed (CSR) form of a relationship graph's adjacency list
+
+    Tables are numbered 0..n-1 in adjacency order. The edges leaving table i
+    are neighbors[indptr[i]:indptr[i + 1]], with edge_sources holding the
+    table each edge leaves from and edges the original edge dictionaries,
+    so a BFS only touches integers until the path is rebuilt. direct maps
+    (from id, to id) to the first edge joining the pair, which is the edge
+    any search returns for a one-step path.
+    """
+
+    __slots__ = ('node_names', 'node_ids', 'indptr', 'neighbors', 'edge_sources', 'edges', 'direct')
+
+    def __init__(self, adjacency: Dict[str, List[Dict]]):
+        self.node_names = list(adjacency)
+        self.node_ids = {table: i for i, table in enumerate(self.node_names)}
+        self.indptr = array('l', [0])
+        self.neighbors = array('l')
+        self.edge_sources = array('l')
+        self.edges = []
+        self.direct = {}
+
+        for i, table in enumerate(self.node_names):
+            for edge in adjacency[table]:
+                to_id = self.node_ids[edge['to']]
+                self.direct.setdefault((i, to_id), len(self.neighbors))
+                self.neighbors.append(to_id)
+                self.edge_sources.append(i)
+                self.edges.append(edge)
+            self.indptr.append(len(self.neighbors))
+
+
+class RelationshipGraph(dict):
+    """
+    Relationship graph dictionary with memoized shortest-path lookups
+
+    Behaves (and serializes) exactly like the dictionary returned by
+    build_relationship_graph(). Path results and the integer adjacency
+    arrays are cached per instance, so the graph must not be modified after
+    creation, and returned paths are shared between callers.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.path = functools.lru_cache(maxsize=PATH_CACHE_SIZE)(self._find_path)
+
+    @functools.cached_property
+    def arrays(self) -> AdjacencyArrays:
+        return AdjacencyArrays(self['adjacency'])
+
+    def _find_path(self, start_table: str, end_table: str) -> Optional[List[Dict]]:
+        return find_path_between_tables(self, start_table, end_table)
+
+
+def build_graph_from_foreign_keys(
+    foreign_keys: List[Dict],
+    many_to_many: List[Dict]
+) -> Dict:
     """
-    foreign_keys = get_foreign_keys(conn, schema)
-    many_to_many = detect_many_to_many(conn, schema)
+    Build relationship graph from already-fetched relationships
 
-    # Build adjacency list
+    Args:
+        foreign_keys: Foreign keys from get_foreign_keys()
+        many_to_many: Junction tables from detect_many_to_many()
+
+    Returns:
+        Relationship graph dictionary (see build_relationship_graph())
+    """
+    # Build adjacency list; every table of a foreign key gets an entry, so
+    # its keys are the graph's nodes
     adjacency = defaultdict(list)
-    nodes = set()
 
     for fk in foreign_keys:
-        from_table = fk['from_table']
-        to_table = fk['to_table']
-
-        nodes.add(from_table)
-        nodes.add(to_table)
+        # Names repeat across edges; share one string per name (a no-op for
+        # rows from get_foreign_keys(), which are already interned)
+        from_table = sys.intern(fk['from_table'])
+        to_table = sys.intern(fk['to_table'])
+        from_column = sys.intern(fk['from_column'])
+        to_column = sys.intern(fk['to_column'])
+        constraint = sys.intern(fk['constraint_name'])
 
         adjacency[from_table].append({
             'to': to_table,
-            'from_column': fk['from_column'],
-            'to_column': fk['to_column'],
-            'constraint': fk['constraint_name']
+            'from_column': from_column,
+            'to_column': to_column,
+            'constraint': constraint
         })
 
         # Add reverse relationship
         adjacency[to_table].append({
             'to': from_table,
-            'from_column': fk['to_column'],
-            'to_column': fk['from_column'],
-            'constraint': fk['constraint_name'],
+            'from_column': to_column,
+            'to_column': from_column,
+            'constraint': constraint,
             'reverse': True
         })
 
-    return {
-        'nodes': sorted(list(nodes)),
-        'adjacency': dict(adjacency),
+    # Hand the adjacency over without copying; lookups of unknown tables
+    # must raise KeyError rather than insert empty lists
+    adjacency.default_factory = None
+
+    return RelationshipGraph({
+        'nodes': sorted(adjacency),
+        'adjacency': adjacency,
         'foreign_keys': foreign_keys,
         'many_to_many': many_to_many
-    }
+    })
+
+
+def build_relationship_graph(conn: psycopg.Connection, schema: str = 'public') -> Dict:
+    """
+    Build a graph of all table relationships
+
+    Args:
+        conn: Database connection
+        schema: Schema name (default: 'public')
+
+    Returns:
+        Dictionary representing relationship graph:
+        {
+            'nodes': [table names],
+            'edges': [{from, to, columns}],
+            'foreign_keys': [fk details],
+            'many_to_many': [m2m details]
+        }
+    """
+    foreign_keys, column_counts = _fetch_catalog_pipelined(conn, schema)
+    many_to_many = detect_many_to_many_from(foreign_keys, column_counts)
+
+    return build_graph_from_foreign_keys(foreign_keys, many_to_many)
+
+
+async def build_relationship_graph_async(
+    aconn: psycopg.AsyncConnection,
+    schema: str = 'public'
+) -> Dict:
+    """
+    Build a relationship graph over an async connection
+
+    Same result as build_relationship_graph(); both catalog queries are
+    pipelined when libpq supports it.
+
+    Args:
+        aconn: Async database connection
+        schema: Schema name (default: 'public')
+
+    Returns:
+        Relationship graph dictionary (see build_relationship_graph())
+    """
+    async with aconn.cursor(row_factory=interned_dict_row) as fk_cur, aconn.cursor() as count_cur:
+        if psycopg.Pipeline.is_supported():
+            async with aconn.pipeline():
+                await fk_cur.execute(foreign_keys_query(), (schema,))
+                await count_cur.execute(COLUMN_COUNTS_QUERY, (schema,))
+        else:
+            await fk_cur.execute(foreign_keys_query(), (schema,))
+            await count_cur.execute(COLUMN_COUNTS_QUERY, (schema,))
+
+        foreign_keys = await fk_cur.fetchall()
+        column_counts = dict(await count_cur.fetchall())
+
+    many_to_many = detect_many_to_many_from(foreign_keys, column_counts)
+    return build_graph_from_foreign_keys(foreign_keys, many_to_many)
+
+
+async def build_graphs_for_schemas(connection_string: str, schemas: List[str]) -> Dict[str, Dict]:
+    """
+    Build relationship graphs for several schemas concurrently
+
+    Each schema gets its own connection (at most MAX_SCHEMA_CONNECTIONS
+    open at once), so catalog queries for different schemas overlap
+    instead of running one after another.
+
+    Args:
+        connection_string: PostgreSQL connection string
+        schemas: Schema names
+
+    Returns:
+        Dictionary mapping schema name to its relationship graph
+    """
+    semaphore = asyncio.Semaphore(MAX_SCHEMA_CONNECTIONS)
+
+    async def build(schema: str) -> Dict:
+        async with semaphore:
+            async with await psycopg.AsyncConnection.connect(
+                connection_string,
+                prepare_threshold=0
+            ) as aconn:
+                return await build_relationship_graph_async(aconn, schema)
+
+    graphs = await asyncio.gather(*(build(schema) for schema in schemas))
+    return dict(zip(schemas, graphs))
+
+
+def get_relationship_graphs(connection_string: str, schemas: List[str]) -> Dict[str, Dict]:
+    """
+    Synchronous entry point for build_graphs_for_schemas()
+
+    Args:
+        connection_string: PostgreSQL connection string
+        schemas: Schema names
+
+    Returns:
+        Dictionary mapping schema name to its relationship graph
+    """
+    logger.info(
+        f"Analyzing {len(schemas)} schemas on: {mask_connection_string(connection_string)}"
+    )
+
+    # psycopg's async connections cannot use the default Windows event loop
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    return asyncio.run(build_graphs_for_schemas(connection_string, schemas))
+
+
+def get_graph_cache_path(connection_string: str, schema: str) -> str:
+    """
+    Get path for storing a cached relationship graph
+
+    Args:
+        connection_string: Database connection string (password is ignored)
+        schema: Schema name
+
+    Returns:
+        Path to cache file
+    """
+    masked = mask_connection_string(connection_string)
+    cache_hash = hashlib.blake2b(f"{masked}:{schema}".encode(), digest_size=6).hexdigest()
+    return f"/tmp/text2sql_relationships_{cache_hash}.json"
+
+
+def get_schema_fingerprint(conn: psycopg.Connection, schema: str = 'public') -> str:
+    """
+    Fingerprint the foreign keys and table columns of a schema
+
+    Args:
+        conn: Database connection
+        schema: Schema name (default: 'public')
+
+    Returns:
+        MD5 hex digest that changes whenever the relationship graph would
+    """
+    with conn.cursor() as cur:
+        cur.execute(SCHEMA_FINGERPRINT_QUERY, (schema, schema))
+        return cur.fetchone()[0]
+
+
+def get_relationship_graph(
+    conn: psycopg.Connection,
+    schema: str = 'public',
+    use_cache: bool = True,
+    refresh: bool = False
+) -> Dict:
+    """
+    Get the relationship graph, reusing a cached copy while the schema is unchanged
+
+    Graphs are cached in-process and in /tmp, keyed by connection and
+    schema. Each call runs one cheap fingerprint query instead of the
+    catalog queries in build_relationship_graph().
+
+    Args:
+        conn: Database connection
+        schema: Schema name (default: 'public')
+        use_cache: Whether to use cached graphs (default: True)
+        refresh: Rebuild and re-cache the graph even if a cached copy is current
+
+    Returns:
+        Relationship graph dictionary (see build_relationship_graph())
+    """
+    if not use_cache:
+        return build_relationship_graph(conn, schema)
+
+    key = (conn.info.dsn, schema)
+    cache_path = get_graph_cache_path(conn.info.dsn, schema)
+    fingerprint = get_schema_fingerprint(conn, schema)
+
+    # information_schema can list different keys; never reuse graphs across modes
+    if COMPAT_INFO_SCHEMA:
+        fingerprint = f"info_schema:{fingerprint}"
+
+    if not refresh:
+        cached = _GRAPH_CACHE.get(key)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+
+        try:
+            with open(cache_path, 'r') as f:
+                cached_data = json.load(f)
+            if cached_data.get('fingerprint') == fingerprint:
+                logger.info(f"Loaded relationship graph from {cache_path}")
+                graph = RelationshipGraph(cached_data['graph'])
+                _GRAPH_CACHE[key] = (fingerprint, graph)
+                return graph
+        except (OSError, ValueError, KeyError):
+            pass
+
+    graph = build_relationship_graph(conn, schema)
+    _GRAPH_CACHE[key] = (fingerprint, graph)
+
+    try:
+        # Rename a private temp file into place, as schema_scanner.save_cache
+        # does, so concurrent runs never read a half-written cache
+        tmp_path = f"{cache_path}.tmp.{os.getpid()}"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'fingerprint': fingerprint, 'graph': graph}, f, separators=(',', ':'), default=str)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        logger.info(f"Relationship graph cached to {cache_path}")
+    except OSError as e:
+        logger.warning(f"Failed to save relationship cache: {e}")
+
+    return graph
 
 
 def find_path_between_tables(
     graph: Dict,
     start_table: str,
-    end_table: str
+    end_table: str,
+    bidirectional: bool = True
 ) -> Optional[List[Dict]]:
     """
     Find shortest path between two tables using BFS
@@ -222,6 +654,10 @@ def find_path_between_tables(
         graph: Relationship graph from build_relationship_graph()
         start_table: Starting table name
         end_table: Target table name
+        bidirectional: Search from both ends and meet in the middle
+                       (default: True); False runs a single BFS from
+                       start_table. Both return a shortest path, but may
+                       pick different ones when several tie.
 
     Returns:
         List of join steps or None if no path exists
@@ -233,42 +669,387 @@ def find_path_between_tables(
     if start_table == end_table:
         return []
 
-    # BFS to find shortest path
-    queue = deque([(start_table, [])])
-    visited = {start_table}
+    if not isinstance(graph, RelationshipGraph):
+        graph = RelationshipGraph(graph)
+
+    arrays = graph.arrays
+    start = arrays.node_ids[start_table]
+    end = arrays.node_ids[end_table]
+
+    # Most joins are a single foreign key; answer those without searching
+    edge_index = arrays.direct.get((start, end))
+    if edge_index is not None:
+        return [_join_step(arrays, edge_index)]
+
+    if not bidirectional:
+        return find_path_from_set(graph, [start_table], end_table)
+
+    return _bidirectional_bfs(arrays, start, end)
+
+
+def find_path_from_set(
+    graph: Dict,
+    sources: Iterable[str],
+    target_table: str
+) -> Optional[List[Dict]]:
+    """
+    Find shortest path from any of several tables to a target using one BFS
+
+    All sources start at distance 0, so this replaces one BFS per source.
+    Ties go to the source listed first.
+
+    Args:
+        graph: Relationship graph from build_relationship_graph()
+        sources: Starting table names
+        target_table: Target table name
+
+    Returns:
+        List of join steps from the nearest source (empty if the target is a
+        source), or None if no path exists
+    """
+    if not isinstance(graph, RelationshipGraph):
+        graph = RelationshipGraph(graph)
+
+    arrays = graph.arrays
+    target = arrays.node_ids.get(target_table)
+    if target is None:
+        return None
+
+    source_ids = [arrays.node_ids[s] for s in sources if s in arrays.node_ids]
+    if target in source_ids:
+        return []
+
+    parent_edge = _bfs_parent_edges(arrays, source_ids, target)
+    if parent_edge is None:
+        return None
+
+    return _reconstruct_path(arrays, parent_edge, target)
+
+
+def _bfs_parent_edges(
+    arrays: AdjacencyArrays,
+    source_ids: List[int],
+    target: int
+) -> Optional[Sequence[int]]:
+    """
+    Breadth-first search over integer table ids
+
+    Args:
+        arrays: Adjacency arrays of the graph
+        source_ids: Starting table ids (distance 0)
+        target: Target table id
+
+    Returns:
+        Map of table id -> index of the edge it was reached through (-1 for
+        sources and unreached tables), or None if the target is unreachable.
+        Graphs of JIT_MIN_TABLES or more tables are searched by the numba
+        kernel from _load_jit_bfs() when numba is installed.
+    """
+    if len(arrays.node_names) >= JIT_MIN_TABLES:
+        bfs_csr = _load_jit_bfs()
+        if bfs_csr is not None:
+            import numpy as np
+
+            parent_edge = np.full(len(arrays.node_names), -1, dtype=np.int64)
+            found = bfs_csr(
+                np.frombuffer(arrays.indptr, dtype=arrays.indptr.typecode),
+                np.frombuffer(arrays.neighbors, dtype=arrays.neighbors.typecode),
+                np.array(source_ids, dtype=np.int64),
+                target,
+                parent_edge
+            )
+            return parent_edge if found else None
+
+    indptr = arrays.indptr
+    neighbors = arrays.neighbors
+    seen = bytearray(len(arrays.node_names))
+    parent_edge = [-1] * len(arrays.node_names)
 
-    while queue:
-        current_table, path = queue.popleft()
+    queue = []
+    for source in source_ids:
+        if not seen[source]:
+            seen[source] = 1
+            queue.append(source)
 
-        for edge in graph['adjacency'][current_table]:
-            next_table = edge['to']
+    head = 0
+    while head < len(queue):
+        current = queue[head]
+        head += 1
 
-            if next_table in visited:
+        for edge_index in range(indptr[current], indptr[current + 1]):
+            next_id = neighbors[edge_index]
+
+            if seen[next_id]:
                 continue
 
-            new_path = path + [{
-                'from': current_table,
-                'to': next_table,
-                'from_column': edge.get('from_column'),
-                'to_column': edge.get('to_column'),
-                'constraint': edge.get('constraint'),
-                'reverse': edge.get('reverse', False)
-            }]
+            seen[next_id] = 1
+            parent_edge[next_id] = edge_index
+
+            if next_id == target:
+                return parent_edge
+
+            queue.append(next_id)
+
+    return None
+
+
+def _bidirectional_bfs(arrays: AdjacencyArrays, start: int, end: int) -> Optional[List[Dict]]:
+    """
+    Shortest path by expanding the smaller of two BFS frontiers a level at a time
+
+    Every foreign key is stored in both directions, so the backward search
+    walks the same arrays and its edges are flipped when the halves are
+    stitched together.
+
+    Args:
+        arrays: Adjacency arrays of the graph
+        start: Starting table id
+        end: Target table id (different from start)
+
+    Returns:
+        List of join steps from start to end, or None if no path exists
+    """
+    indptr = arrays.indptr
+    neighbors = arrays.neighbors
+
+    # table id -> edge index it was reached through (-1 for the endpoint)
+    forward = {start: -1}
+    backward = {end: -1}
+    forward_frontier = [start]
+    backward_frontier = [end]
+
+    while forward_frontier and backward_frontier:
+        expand_forward = len(forward_frontier) <= len(backward_frontier)
+        if expand_forward:
+            frontier, parent, other = forward_frontier, forward, backward
+        else:
+            frontier, parent, other = backward_frontier, backward, forward
+
+        # Levels are expanded whole and the frontiers were disjoint so far,
+        # so the first meeting found is on a shortest path
+        next_frontier = []
+        for current in frontier:
+            for edge_index in range(indptr[current], indptr[current + 1]):
+                next_id = neighbors[edge_index]
+
+                if next_id in parent:
+                    continue
+
+                parent[next_id] = edge_index
 
-            if next_table == end_table:
-                return new_path
+                if next_id in other:
+                    return _stitch_path(arrays, forward, backward, next_id)
 
-            visited.add(next_table)
-            queue.append((next_table, new_path))
+                next_frontier.append(next_id)
+
+        if expand_forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
 
     return None
 
 
+def _stitch_path(
+    arrays: AdjacencyArrays,
+    forward: Dict[int, int],
+    backward: Dict[int, int],
+    meeting: int
+) -> List[Dict]:
+    """
+    Join the two halves of a bidirectional search at the meeting table
+
+    Args:
+        arrays: Adjacency arrays of the graph
+        forward: Parent edges of the search from the start table
+        backward: Parent edges of the search from the target table
+        meeting: Table id reached by both searches
+
+    Returns:
+        List of join steps from the start table to the target
+    """
+    path = []
+    node = meeting
+    while forward[node] != -1:
+        edge_index = forward[node]
+        path.append(_join_step(arrays, edge_index))
+        node = arrays.edge_sources[edge_index]
+    path.reverse()
+
+    # Backward edges point towards the meeting table; join them the other way
+    node = meeting
+    while backward[node] != -1:
+        edge_index = backward[node]
+        path.append(_join_step(arrays, edge_index, flip=True))
+        node = arrays.edge_sources[edge_index]
+
+    return path
+
+
+@functools.lru_cache(maxsize=None)
+def _load_jit_bfs() -> Optional[Callable]:
+    """
+    Compile the BFS kernel with numba (cached on disk across runs)
+
+    Returns:
+        Compiled function with the same contract as the Python loop in
+        _bfs_parent_edges() (fills parent_edge, returns 1 if the target was
+        reached), or None if numba is not installed
+    """
+    try:
+        import numpy as np
+        from numba import njit
+    except ImportError:
+        return None
+
+    @njit(cache=True)
+    def bfs_csr(indptr, neighbors, sources, target, parent_edge):
+        # Every table is queued at most once, so a flat buffer of n slots
+        # serves as the queue
+        queue = np.empty(parent_edge.shape[0], dtype=np.int64)
+        seen = np.zeros(parent_edge.shape[0], dtype=np.uint8)
+        tail = 0
+        for source in sources:
+            if not seen[source]:
+                seen[source] = 1
+                queue[tail] = source
+                tail += 1
+
+        head = 0
+        while head < tail:
+            current = queue[head]
+            head += 1
+
+            for edge_index in range(indptr[current], indptr[current + 1]):
+                next_id = neighbors[edge_index]
+
+                if seen[next_id]:
+                    continue
+
+                seen[next_id] = 1
+                parent_edge[next_id] = edge_index
+
+                if next_id == target:
+                    return 1
+
+                queue[tail] = next_id
+                tail += 1
+
+        return 0
+
+    return bfs_csr
+
+
+def _reconstruct_path(arrays: AdjacencyArrays, parent_edge: Sequence[int], target: int) -> List[Dict]:
+    """
+    Walk BFS parent edges back from the target table
+
+    Args:
+        arrays: Adjacency arrays of the graph
+        parent_edge: Map of table id -> edge index from _bfs_parent_edges()
+        target: Target table id
+
+    Returns:
+        List of join steps from the start table to the target
+    """
+    path = []
+    node = target
+
+    while parent_edge[node] != -1:
+        edge_index = parent_edge[node]
+        path.append(_join_step(arrays, edge_index))
+        node = arrays.edge_sources[edge_index]
+
+    path.reverse()
+    return path
+
+
+def _join_step(arrays: AdjacencyArrays, edge_index: int, flip: bool = False) -> Dict:
+    """
+    Build a join step from an edge of the adjacency arrays
+
+    Args:
+        arrays: Adjacency arrays of the graph
+        edge_index: Index of the edge
+        flip: Join along the opposite direction of the edge (default: False)
+
+    Returns:
+        Join step dictionary
+    """
+    edge = arrays.edges[edge_index]
+    from_table = arrays.node_names[arrays.edge_sources[edge_index]]
+    to_table = edge['to']
+
+    if flip:
+        return {
+            'from': to_table,
+            'to': from_table,
+            'from_column': edge.get('to_column'),
+            'to_column': edge.get('from_column'),
+            'constraint': edge.get('constraint'),
+            'reverse': not edge.get('reverse', False)
+        }
+
+    return {
+        'from': from_table,
+        'to': to_table,
+        'from_column': edge.get('from_column'),
+        'to_column': edge.get('to_column'),
+        'constraint': edge.get('constraint'),
+        'reverse': edge.get('reverse', False)
+    }
+
+
+def _direct_fk(conn: psycopg.Connection, schema: str, table1: str, table2: str) -> Optional[Dict]:
+    """
+    Look up a foreign key directly connecting two tables
+
+    Args:
+        conn: Database connection
+        schema: Schema name
+        table1: Table to join from
+        table2: Table to join to
+
+    Returns:
+        Join step from table1 to table2, or None if no foreign key
+        connects them directly
+    """
+    with conn.cursor(row_factory=dict_row) as cur:
+        cur.execute(
+            DIRECT_FK_QUERY.format(fk_query=foreign_keys_query()),
+            (schema, table1, table2, table2, table1)
+        )
+        fk = cur.fetchone()
+
+    if fk is None:
+        return None
+
+    if fk['from_table'] == table1:
+        return {
+            'from': table1,
+            'to': table2,
+            'from_column': fk['from_column'],
+            'to_column': fk['to_column'],
+            'constraint': fk['constraint_name'],
+            'reverse': False
+        }
+
+    return {
+        'from': table1,
+        'to': table2,
+        'from_column': fk['to_column'],
+        'to_column': fk['from_column'],
+        'constraint': fk['constraint_name'],
+        'reverse': True
+    }
+
+
 def suggest_join_pattern(
     conn: psycopg.Connection,
     table1: str,
     table2: str,
-    schema: str = 'public'
+    schema: str = 'public',
+    graph: Optional[Dict] = None
 ) -> Dict:
     """
     Suggest JOIN SQL for connecting two tables
@@ -278,6 +1059,7 @@ def suggest_join_pattern(
         table1: First table name
         table2: Second table name
         schema: Schema name (default: 'public')
+        graph: Prebuilt relationship graph (default: cached graph for schema)
 
     Returns:
         Dictionary with join suggestion:
@@ -288,8 +1070,23 @@ def suggest_join_pattern(
             'explanation': human-readable explanation
         }
     """
-    graph = build_relationship_graph(conn, schema)
-    path = find_path_between_tables(graph, table1, table2)
+    path = None
+
+    if graph is None:
+        # A direct foreign key takes one targeted query; the graph is only
+        # needed for longer paths
+        if table1 != table2:
+            step = _direct_fk(conn, schema, table1, table2)
+            if step is not None:
+                path = [step]
+
+        if path is None:
+            graph = get_relationship_graph(conn, schema)
+    elif not isinstance(graph, RelationshipGraph):
+        graph = RelationshipGraph(graph)
+
+    if path is None:
+        path = graph.path(table1, table2)
 
     if not path:
         return {
@@ -330,7 +1127,8 @@ def generate_join_query(
     conn: psycopg.Connection,
     tables: List[str],
     schema: str = 'public',
-    select_all: bool = False
+    select_all: bool = False,
+    graph: Optional[Dict] = None
 ) -> Dict:
     """
     Generate multi-table JOIN query based on relationships
@@ -340,6 +1138,7 @@ def generate_join_query(
         tables: List of table names to join
         schema: Schema name (default: 'public')
         select_all: Whether to SELECT * from all tables (default: False)
+        graph: Prebuilt relationship graph (default: cached graph for schema)
 
     Returns:
         Dictionary with generated query:
@@ -350,6 +1149,9 @@ def generate_join_query(
             'paths': join paths used
         }
     """
+    # Drop repeated table names, keeping the first occurrence
+    tables = list(dict.fromkeys(tables))
+
     if len(tables) < 2:
         return {
             'success': False,
@@ -358,22 +1160,21 @@ def generate_join_query(
             'paths': []
         }
 
-    graph = build_relationship_graph(conn, schema)
+    if graph is None:
+        graph = get_relationship_graph(conn, schema)
+    elif not isinstance(graph, RelationshipGraph):
+        graph = RelationshipGraph(graph)
 
     # Find path connecting all tables (start with first table, connect to others)
     base_table = tables[0]
     all_paths = []
-    joined_tables = {base_table}
+    joined_tables = [base_table]
 
     for target_table in tables[1:]:
-        # Try to find path from any already-joined table to the target
-        path = None
-        for joined_table in joined_tables:
-            path = find_path_between_tables(graph, joined_table, target_table)
-            if path:
-                break
-
-        if not path:
+        # Nearest path from any already-joined table to the target
+        path = find_path_from_set(graph, joined_tables, target_table)
+
+        if path is None:
             return {
                 'success': False,
                 'sql': None,
@@ -383,19 +1184,20 @@ def generate_join_query(
 
         all_paths.extend(path)
 
-        # Add all tables in path to joined set
+        # Add all tables in path to joined set (in join order)
         for step in path:
-            joined_tables.add(step['to'])
+            if step['to'] not in joined_tables:
+                joined_tables.append(step['to'])
 
-    # Remove duplicate joins (if same table appears in multiple paths)
-    unique_joins = []
-    seen_joins = set()
+    # Growing from the first table depends on the order tables were given;
+    # prefer the spanning-tree plan when it needs fewer joins
+    if len(tables) > 2:
+        steiner_paths = _steiner_join_steps(graph, tables)
+        if len(steiner_paths) < len(all_paths):
+            all_paths = steiner_paths
 
-    for step in all_paths:
-        join_key = (step['from'], step['to'], step['from_column'], step['to_column'])
-        if join_key not in seen_joins:
-            unique_joins.append(step)
-            seen_joins.add(join_key)
+    # Each step joins a table that was not joined yet, so no join repeats
+    unique_joins = all_paths
 
     # Generate SQL
     if select_all:
@@ -423,6 +1225,132 @@ def generate_join_query(
     }
 
 
+def _steiner_join_steps(graph: 'RelationshipGraph', tables: List[str]) -> List[Dict]:
+    """
+    Join steps connecting tables along a Steiner tree approximation
+
+    Shortest paths between every pair of tables are combined along the
+    minimum spanning tree of their lengths (Kruskal), then tables that only
+    dead-end the resulting tree are dropped (Kou-Markowsky-Berman
+    heuristic, at most twice the optimal number of joins).
+
+    Args:
+        graph: Relationship graph
+        tables: Distinct table names, all connected to each other
+
+    Returns:
+        List of join steps starting from tables[0], each joining one new table
+    """
+    arrays = graph.arrays
+    ids = [arrays.node_ids[table] for table in tables]
+
+    # Shortest path tree from every requested table
+    trees = [_bfs_tree(arrays, source, ids) for source in ids]
+
+    # Kruskal over the complete graph of requested tables; ties keep input order
+    pairs = sorted(
+        (trees[i][1][ids[j]], i, j)
+        for i in range(len(ids))
+        for j in range(i + 1, len(ids))
+    )
+    component = list(range(len(ids)))
+
+    def find(i: int) -> int:
+        while component[i] != i:
+            component[i] = component[component[i]]
+            i = component[i]
+        return i
+
+    # Edges of the chosen shortest paths, by table id
+    plan = defaultdict(list)
+    for _, i, j in pairs:
+        root_i, root_j = find(i), find(j)
+        if root_i == root_j:
+            continue
+        component[root_j] = root_i
+
+        parent_edge = trees[i][0]
+        node = ids[j]
+        while parent_edge[node] != -1:
+            edge_index = parent_edge[node]
+            previous = arrays.edge_sources[edge_index]
+            plan[previous].append(edge_index)
+            plan[node].append(edge_index)
+            node = previous
+
+    # Spanning tree of the combined paths, grown from the first table
+    tree_edge = {ids[0]: -1}
+    order = [ids[0]]
+    for current in order:
+        for edge_index in plan[current]:
+            other = _other_end(arrays, edge_index, current)
+            if other not in tree_edge:
+                tree_edge[other] = edge_index
+                order.append(other)
+
+    # Keep requested tables and the tables leading to them
+    keep = set(ids)
+    for node in reversed(order):
+        edge_index = tree_edge[node]
+        if node in keep and edge_index != -1:
+            keep.add(_other_end(arrays, edge_index, node))
+
+    steps = []
+    for node in order[1:]:
+        if node in keep:
+            edge_index = tree_edge[node]
+            parent = _other_end(arrays, edge_index, node)
+            steps.append(_join_step(arrays, edge_index, flip=arrays.edge_sources[edge_index] != parent))
+
+    return steps
+
+
+def _other_end(arrays: AdjacencyArrays, edge_index: int, node: int) -> int:
+    """Table id at the opposite end of an edge from node"""
+    if arrays.edge_sources[edge_index] == node:
+        return arrays.neighbors[edge_index]
+    return arrays.edge_sources[edge_index]
+
+
+def _bfs_tree(arrays: AdjacencyArrays, source: int, targets: List[int]) -> Tuple[List[int], Dict[int, int]]:
+    """
+    Shortest path tree from one table, grown until all targets are reached
+
+    Args:
+        arrays: Adjacency arrays of the graph
+        source: Starting table id
+        targets: Table ids to reach
+
+    Returns:
+        Tuple of (parent edge per table id, distance per reached target)
+    """
+    indptr = arrays.indptr
+    neighbors = arrays.neighbors
+    parent_edge = [-1] * len(arrays.node_names)
+    distance = {source: 0}
+    remaining = set(targets)
+    remaining.discard(source)
+
+    queue = [source]
+    head = 0
+    while head < len(queue) and remaining:
+        current = queue[head]
+        head += 1
+
+        for edge_index in range(indptr[current], indptr[current + 1]):
+            next_id = neighbors[edge_index]
+
+            if next_id in distance:
+                continue
+
+            distance[next_id] = distance[current] + 1
+            parent_edge[next_id] = edge_index
+            remaining.discard(next_id)
+            queue.append(next_id)
+
+    return parent_edge, {target: distance[target] for target in targets if target in distance}
+
+
 def format_relationships_output(
     foreign_keys: List[Dict],
     many_to_many: List[Dict],
@@ -445,56 +1373,83 @@ def format_relationships_output(
             'many_to_many': many_to_many
         }, indent=2)
 
-    # Markdown format
-    lines = []
-    lines.append("# Database Relationships")
-    lines.append("")
-
-    # Foreign Keys
-    lines.append(f"## Foreign Keys ({len(foreign_keys)})")
-    lines.append("")
-
+    # Markdown format: build each section with one join per level
     if foreign_keys:
         # Group by source table
         by_table = defaultdict(list)
         for fk in foreign_keys:
             by_table[fk['from_table']].append(fk)
 
-        for table_name in sorted(by_table.keys()):
-            lines.append(f"### {table_name}")
-            for fk in by_table[table_name]:
-                arrow = "→"
-                lines.append(
-                    f"- `{fk['from_column']}` {arrow} `{fk['to_table']}.{fk['to_column']}` "
-                    f"(ON DELETE: {fk['on_delete']}, ON UPDATE: {fk['on_update']})"
-                )
-            lines.append("")
+        fk_section = '\n\n'.join(
+            f"### {table_name}\n" + '\n'.join(
+                f"- `{fk['from_column']}` → `{fk['to_table']}.{fk['to_column']}` "
+                f"(ON DELETE: {fk['on_delete']}, ON UPDATE: {fk['on_update']})"
+                for fk in by_table[table_name]
+            )
+            for table_name in sorted(by_table)
+        )
     else:
-        lines.append("*No foreign keys found*")
-        lines.append("")
-
-    # Many-to-Many
-    lines.append(f"## Many-to-Many Relationships ({len(many_to_many)})")
-    lines.append("")
+        fk_section = "*No foreign keys found*"
 
     if many_to_many:
-        for m2m in many_to_many:
-            lines.append(f"### {m2m['table1']} ↔ {m2m['table2']}")
-            lines.append(f"- Junction table: `{m2m['junction_table']}`")
-            lines.append(
-                f"- {m2m['table1']}.{m2m['table1_column']} ← "
-                f"{m2m['junction_table']}.{m2m['junction_column1']}"
-            )
-            lines.append(
-                f"- {m2m['table2']}.{m2m['table2_column']} ← "
-                f"{m2m['junction_table']}.{m2m['junction_column2']}"
-            )
-            lines.append("")
+        m2m_section = '\n\n'.join(
+            f"### {m2m['table1']} ↔ {m2m['table2']}\n"
+            f"- Junction table: `{m2m['junction_table']}`\n"
+            f"- {m2m['table1']}.{m2m['table1_column']} ← "
+            f"{m2m['junction_table']}.{m2m['junction_column1']}\n"
+            f"- {m2m['table2']}.{m2m['table2_column']} ← "
+            f"{m2m['junction_table']}.{m2m['junction_column2']}"
+            for m2m in many_to_many
+        )
     else:
-        lines.append("*No many-to-many relationships detected*")
-        lines.append("")
+        m2m_section = "*No many-to-many relationships detected*"
+
+    return (
+        "# Database Relationships\n\n"
+        f"## Foreign Keys ({len(foreign_keys)})\n\n"
+        f"{fk_section}\n\n"
+        f"## Many-to-Many Relationships ({len(many_to_many)})\n\n"
+        f"{m2m_section}\n"
+    )
+
 
-    return '\n'.join(lines)
+def print_schemas_relationships(args: argparse.Namespace) -> int:
+    """
+    Print relationships of every schema in --schemas
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Exit code
+    """
+    if args.suggest_join or args.generate_join:
+        print("Error: --schemas only supports listing relationships and --detect-m2m")
+        return 1
+
+    schemas = [schema.strip() for schema in args.schemas.split(',') if schema.strip()]
+    graphs = get_relationship_graphs(args.connection_string, schemas)
+
+    if args.output_format == 'json':
+        if args.detect_m2m:
+            output = {schema: {'many_to_many': graph['many_to_many']} for schema, graph in graphs.items()}
+        else:
+            output = {
+                schema: {
+                    'foreign_keys': graph['foreign_keys'],
+                    'many_to_many': graph['many_to_many']
+                }
+                for schema, graph in graphs.items()
+            }
+        print(json.dumps(output, indent=2))
+        return 0
+
+    for schema, graph in graphs.items():
+        print(f"# Schema: {schema}\n")
+        foreign_keys = [] if args.detect_m2m else graph['foreign_keys']
+        print(format_relationships_output(foreign_keys, graph['many_to_many']))
+
+    return 0
 
 
 def main():
@@ -515,6 +1470,12 @@ Examples:
 
   # Detect many-to-many relationships
   %(prog)s --connection-string $DB_URL --detect-m2m
+
+  # Rebuild the cached relationship graph
+  %(prog)s --connection-string $DB_URL --refresh-cache
+
+  # List relationships of several schemas (analyzed concurrently)
+  %(prog)s --connection-string $DB_URL --schemas tenant_a,tenant_b
         """
     )
 
@@ -528,6 +1489,11 @@ Examples:
         default='public',
         help='Schema name (default: public)'
     )
+    parser.add_argument(
+        '--schemas',
+        help='Comma-separated schema names to analyze concurrently '
+             '(relationship listing and --detect-m2m only; overrides --schema)'
+    )
     parser.add_argument(
         '--table1',
         help='First table name (for JOIN suggestion)'
@@ -558,6 +1524,16 @@ Examples:
         default='markdown',
         help='Output format (default: markdown)'
     )
+    parser.add_argument(
+        '--refresh-cache',
+        action='store_true',
+        help='Rebuild the cached relationship graph'
+    )
+    parser.add_argument(
+        '--compat-info-schema',
+        action='store_true',
+        help='Read foreign keys from information_schema instead of pg_catalog (slower)'
+    )
     parser.add_argument(
         '--verbose',
         '-v',
@@ -573,17 +1549,29 @@ Examples:
     else:
         logger.setLevel(logging.WARNING)
 
+    global COMPAT_INFO_SCHEMA
+    COMPAT_INFO_SCHEMA = args.compat_info_schema
+
     try:
+        if args.schemas:
+            return print_schemas_relationships(args)
+
         # Connect to database
         conn = connect_to_database(args.connection_string)
 
+        # --suggest-join loads the graph itself, only if the tables are not
+        # directly related
+        graph = None
+        if args.refresh_cache or not args.suggest_join:
+            graph = get_relationship_graph(conn, args.schema, refresh=args.refresh_cache)
+
         # Suggest JOIN between two tables
         if args.suggest_join:
             if not args.table1 or not args.table2:
                 print("Error: --suggest-join requires --table1 and --table2")
                 return 1
 
-            result = suggest_join_pattern(conn, args.table1, args.table2, args.schema)
+            result = suggest_join_pattern(conn, args.table1, args.table2, args.schema, graph=graph)
 
             if args.output_format == 'json':
                 print(json.dumps(result, indent=2))
@@ -600,7 +1588,7 @@ Examples:
 
         # Generate multi-table JOIN
         elif args.generate_join:
-            result = generate_join_query(conn, args.generate_join, args.schema)
+            result = generate_join_query(conn, args.generate_join, args.schema, graph=graph)
 
             if args.output_format == 'json':
                 print(json.dumps(result, indent=2, default=str))
@@ -617,7 +1605,7 @@ Examples:
 
         # Detect many-to-many
         elif args.detect_m2m:
-            many_to_many = detect_many_to_many(conn, args.schema)
+            many_to_many = graph['many_to_many']
 
             if args.output_format == 'json':
                 print(json.dumps({'many_to_many': many_to_many}, indent=2))
@@ -627,10 +1615,11 @@ Examples:
 
         # Default: show all relationships
         else:
-            foreign_keys = get_foreign_keys(conn, args.schema)
-            many_to_many = detect_many_to_many(conn, args.schema)
-
-            output = format_relationships_output(foreign_keys, many_to_many, args.output_format)
+            output = format_relationships_output(
+                graph['foreign_keys'],
+                graph['many_to_many'],
+                args.output_format
+            )
             print(output)
 
         conn.close()
@@ -5,29 +5,42 @@ Validates SQL syntax, checks against schema, and provides query explanations
 """
 
 import argparse
+import functools
+import hashlib
 import json
 import logging
+import os
 import re
 import sys
-from typing import Dict, List, Optional, Tuple
-from urllib.parse import urlparse
+import weakref
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
 
-try:
+# psycopg is imported in connect_to_database, so --help and argument errors
+# do not pay for loading it
+if TYPE_CHECKING:
     import psycopg
-except ImportError:
-    print("Error: psycopg library not found. Please install it:")
-    print("  pip install 'psycopg[binary]'")
-    sys.exit(1)
 
 try:
     import sqlparse
-    from sqlparse.sql import IdentifierList, Identifier, Where, Token
-    from sqlparse.tokens import Keyword, DML
+    from sqlparse.sql import IdentifierList, Identifier, Statement, Where, Token
+    from sqlparse.tokens import Comparison, DML, Keyword, String, Wildcard
 except ImportError:
     print("Error: sqlparse library not found. Please install it:")
     print("  pip install sqlparse")
     sys.exit(1)
 
+# Shared JSON helpers; orjson is optional and imported by schema_scanner
+sys.path.insert(0, os.path.dirname(__file__))
+from schema_scanner import dumps_json, orjson
+
+# pglast is optional: PostgreSQL's own parser also finds tables in
+# subqueries and DML targets, which the sqlparse walk misses
+try:
+    from pglast import parser as pg_parser
+except ImportError:
+    pg_parser = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,42 +48,123 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Password in a connection URL: after the user name and before the last '@'
+# of the host part. Only that span is masked, not other copies of the text
+URL_PASSWORD_RE = re.compile(r'(://[^:/?#@]*:)[^/?#]+(@)')
+
+# Injection heuristics, each with the warning it produces. Keywords are
+# lowercase: the query is lowercased once rather than case-folded per pattern
+DANGEROUS_PATTERNS = [
+    (re.compile(pattern), warning)
+    for pattern, warning in [
+        (r";\s*drop\s+", "Detected DROP statement after semicolon"),
+        (r";\s*delete\s+", "Detected DELETE statement after semicolon"),
+        (r";\s*update\s+", "Detected UPDATE statement after semicolon"),
+        (r";\s*insert\s+", "Detected INSERT statement after semicolon"),
+        (r"--\s*$", "SQL comment at end of query"),
+        (r"/\*.*\*/", "Block comment detected"),
+    ]
+]
+
+# String concatenation indicators
+CONCAT_RE = re.compile(r"\+\s*['\"]|['\"]\\s*\+")
+
+# Every injection check in reporting order, for the single-pass scanner
+INJECTION_CHECKS = DANGEROUS_PATTERNS + [(CONCAT_RE, "Possible string concatenation detected")]
+
+# Queries at least this long and pure ASCII use the Hyperscan database; the
+# one-off compile (~12 ms) outweighs the gain on short queries
+HYPERSCAN_MIN_LENGTH = 16384
+
+# re's \s restricted to ASCII, for the Hyperscan expressions
+HS_WHITESPACE_CLASS = r'[\t-\r\x1c-\x20]'
+
+# Keywords that start and end the FROM/JOIN section in the sqlparse walk
+FROM_KEYWORDS = frozenset({'FROM', 'JOIN', 'INNER JOIN', 'LEFT JOIN', 'RIGHT JOIN', 'FULL JOIN', 'CROSS JOIN'})
+FROM_END_KEYWORDS = frozenset({'WHERE', 'GROUP', 'ORDER', 'LIMIT', 'HAVING'})
+
+# Fallback table extraction when sqlparse fails. No nested quantifiers, so
+# matching stays linear in the query length without a DFA engine like re2
+TABLE_FALLBACK_RE = re.compile(r'(?:FROM|JOIN)\s+([a-zA-Z_][a-zA-Z0-9_]*)', re.IGNORECASE)
+
+# In-process table-name cache: (dsn, schema) -> table names
+_SCHEMA_TABLES_CACHE: Dict[Tuple[str, str], FrozenSet[str]] = {}
+
+# Server-side prepared statements created for EXPLAIN: connection -> names
+_PREPARED_EXPLAINS: 'weakref.WeakKeyDictionary[psycopg.Connection, Set[str]]' = weakref.WeakKeyDictionary()
+
+# Every table name in a schema, cached per connection target and schema
+SCHEMA_TABLES_QUERY = """
+    SELECT table_name
+    FROM information_schema.tables
+    WHERE table_schema = %s
+"""
+
+# Up to three similarly named tables for each missing table
+SIMILAR_TABLES_QUERY = """
+    SELECT m.name, t.table_name
+    FROM unnest(%s::text[]) AS m(name)
+    CROSS JOIN LATERAL (
+        SELECT table_name
+        FROM information_schema.tables
+        WHERE table_schema = %s
+        AND table_name ILIKE '%%' || m.name || '%%'
+        ORDER BY table_name
+        LIMIT 3
+    ) t
+"""
+
 
 def mask_connection_string(conn_str: str) -> str:
     """Mask password in connection string for safe display"""
     try:
-        parsed = urlparse(conn_str)
-        if parsed.password:
-            return conn_str.replace(parsed.password, '***')
-        return conn_str
+        return URL_PASSWORD_RE.sub(r'\1***\2', conn_str)
     except Exception:
         return "***connection string***"
 
 
-def connect_to_database(connection_string: str) -> psycopg.Connection:
-    """Establish connection to PostgreSQL database"""
+def connect_to_database(connection_string: str) -> 'psycopg.Connection':
+    """
+    Establish connection to PostgreSQL database
+
+    Statements are prepared server-side from their second run
+    (prepare_threshold=1), so callers validating the same query repeatedly
+    stop re-parsing its EXPLAIN; a single CLI run prepares nothing.
+    """
+    try:
+        import psycopg
+    except ImportError:
+        print("Error: psycopg library not found. Please install it:")
+        print("  pip install 'psycopg[binary]'")
+        sys.exit(1)
+
     try:
         logger.info(f"Connecting to database: {mask_connection_string(connection_string)}")
-        conn = psycopg.connect(connection_string)
+        conn = psycopg.connect(connection_string, prepare_threshold=1)
         return conn
     except Exception as e:
         logger.error(f"Connection failed: {e}")
         raise
 
 
-def validate_syntax(sql: str) -> Tuple[bool, Optional[str]]:
+def validate_syntax(
+    sql: str,
+    parsed: Optional[Tuple[Statement, ...]] = None
+) -> Tuple[bool, Optional[str]]:
     """
     Validate SQL syntax using sqlparse
 
     Args:
         sql: SQL query to validate
+        parsed: Result of sqlparse.parse(sql), if already available
 
     Returns:
         Tuple of (is_valid, error_message)
     """
     try:
         # Parse SQL
-        parsed = sqlparse.parse(sql)
+        if parsed is None:
+            parsed = sqlparse.parse(sql)
 
         if not parsed:
             return False, "Empty or invalid SQL statement"
@@ -91,19 +185,73 @@ def validate_syntax(sql: str) -> Tuple[bool, Optional[str]]:
         return False, f"Syntax error: {str(e)}"
 
 
-def extract_table_names(sql: str) -> List[str]:
+def _range_var_key(range_var: Dict) -> Tuple[Optional[str], str]:
+    """Identify a RangeVar from pglast's JSON parse tree by (schema, name)"""
+    return range_var.get('schemaname'), range_var['relname']
+
+
+def _extract_table_names_pglast(sql: str) -> Set[str]:
+    """
+    Extract table names using PostgreSQL's parser (pglast)
+
+    Args:
+        sql: SQL query
+
+    Returns:
+        Set of table names found in query
+
+    Raises:
+        pglast.parser.ParseError: If PostgreSQL cannot parse the query
+    """
+    tables = set()
+    created = set()
+    cte_names = set()
+
+    def collect(node):
+        # RangeVar fields; DML targets appear without the node-type wrapper
+        if 'relname' in node and 'relpersistence' in node:
+            tables.add(_range_var_key(node))
+        elif 'ctename' in node:
+            cte_names.add(node['ctename'])
+        # Tables the statement creates are not expected to exist yet
+        elif 'CreateStmt' in node:
+            created.add(_range_var_key(node['CreateStmt']['relation']))
+        elif 'ViewStmt' in node:
+            created.add(_range_var_key(node['ViewStmt']['view']))
+        elif 'rel' in node and 'onCommit' in node:  # CREATE TABLE AS / SELECT INTO
+            created.add(_range_var_key(node['rel']))
+        return node
+
+    # The parse tree comes back as JSON; collect nodes while decoding it
+    json.loads(pg_parser.parse_sql_json(sql), object_hook=collect)
+
+    # Unqualified references to WITH queries are not tables
+    return {
+        name for schemaname, name in tables - created
+        if schemaname or name not in cte_names
+    }
+
+
+def extract_table_names(sql: str, statement: Optional[Statement] = None) -> Set[str]:
     """
     Extract table names from SQL query
 
     Args:
         sql: SQL query
+        statement: The query already parsed by sqlparse, if available
 
     Returns:
-        List of table names found in query
+        Set of table names found in query
     """
+    if pg_parser is not None:
+        try:
+            return _extract_table_names_pglast(sql)
+        except pg_parser.ParseError as e:
+            logger.debug(f"pglast could not parse query, using sqlparse: {e}")
+
     try:
-        parsed = sqlparse.parse(sql)[0]
-        tables = []
+        parsed = statement if statement is not None else sqlparse.parse(sql)[0]
+        tables = set()
 
         # Extract from FROM and JOIN clauses
         from_seen = False
@@ -113,31 +261,102 @@ def extract_table_names(sql: str) -> List[str]:
                     for identifier in token.get_identifiers():
                         table_name = identifier.get_real_name()
                         if table_name:
-                            tables.append(table_name)
+                            tables.add(table_name)
                 elif isinstance(token, Identifier):
                     table_name = token.get_real_name()
                     if table_name:
-                        tables.append(table_name)
+                        tables.add(table_name)
 
-            if token.ttype is Keyword and token.value.upper() in ('FROM', 'JOIN', 'INNER JOIN', 'LEFT JOIN', 'RIGHT JOIN'):
-                from_seen = True
-            elif token.ttype is Keyword and token.value.upper() in ('WHERE', 'GROUP', 'ORDER', 'LIMIT', 'HAVING'):
-                from_seen = False
+            # sqlparse upper-cases keywords into .normalized when tokenizing
+            if token.ttype is Keyword:
+                keyword = token.normalized
+                if keyword in FROM_KEYWORDS:
+                    from_seen = True
+                elif keyword in FROM_END_KEYWORDS:
+                    from_seen = False
 
-        return list(set(tables))  # Remove duplicates
+        return tables
 
     except Exception as e:
         logger.debug(f"Error extracting table names: {e}")
         # Fallback: regex extraction
-        pattern = r'(?:FROM|JOIN)\s+([a-zA-Z_][a-zA-Z0-9_]*)'
-        matches = re.findall(pattern, sql, re.IGNORECASE)
-        return list(set(matches))
+        return set(TABLE_FALLBACK_RE.findall(sql))
+
+
+def _cached_schema_tables(
+    conn: 'psycopg.Connection',
+    schema: str,
+    tables: Set[str]
+) -> Optional[FrozenSet[str]]:
+    """
+    Look up the cached table names of a schema
+
+    Args:
+        conn: Database connection
+        schema: Schema name
+        tables: Table names referenced by the query
+
+    Returns:
+        Cached table names, or None if not cached or if a referenced table
+        is missing from them (it may have been created since)
+    """
+    known = _SCHEMA_TABLES_CACHE.get((conn.info.dsn, schema))
+    if known is None or not tables <= known:
+        return None
+    return known
+
+
+def _cache_schema_tables(conn: 'psycopg.Connection', schema: str, cur: 'psycopg.Cursor') -> FrozenSet[str]:
+    """Store the result of SCHEMA_TABLES_QUERY in the table-name cache"""
+    known = frozenset(row[0] for row in cur.fetchall())
+    _SCHEMA_TABLES_CACHE[(conn.info.dsn, schema)] = known
+    return known
+
+
+def _missing_table_errors(
+    cur: 'psycopg.Cursor',
+    tables: Set[str],
+    known: FrozenSet[str],
+    schema: str
+) -> List[str]:
+    """
+    Report referenced tables missing from the schema
+
+    Args:
+        cur: Cursor for the similar-table lookup
+        tables: Table names referenced by the query
+        known: Table names in the schema
+        schema: Schema name
+
+    Returns:
+        List of errors, one per missing table
+    """
+    missing = [table for table in tables if table not in known]
+    errors = []
+
+    if missing:
+        # Try to find similar table names, up to three per missing table
+        cur.execute(SIMILAR_TABLES_QUERY, (missing, schema))
+        similar = defaultdict(list)
+        for table, similar_name in cur.fetchall():
+            similar[table].append(similar_name)
+
+        for table in missing:
+            error_msg = f"Table '{table}' does not exist in schema '{schema}'"
+
+            if similar[table]:
+                error_msg += f". Did you mean: {', '.join(similar[table])}?"
+
+            errors.append(error_msg)
+
+    return errors
 
 
 def validate_against_schema(
     sql: str,
-    conn: psycopg.Connection,
-    schema: str = 'public'
+    conn: 'psycopg.Connection',
+    schema: str = 'public',
+    statement: Optional[Statement] = None
 ) -> Tuple[bool, List[str]]:
     """
     Verify tables and columns exist in schema
@@ -146,50 +365,24 @@ def validate_against_schema(
         sql: SQL query
         conn: Database connection
         schema: Schema name
+        statement: The query already parsed by sqlparse, if available
 
     Returns:
         Tuple of (is_valid, list_of_errors)
     """
-    errors = []
-
     try:
         # Extract table names
-        tables = extract_table_names(sql)
+        tables = extract_table_names(sql, statement)
 
         if not tables:
             return True, []  # No tables to validate
 
-        # Check if tables exist
         with conn.cursor() as cur:
-            for table in tables:
-                cur.execute("""
-                    SELECT EXISTS (
-                        SELECT 1
-                        FROM information_schema.tables
-                        WHERE table_schema = %s
-                        AND table_name = %s
-                    )
-                """, (schema, table))
-
-                exists = cur.fetchone()[0]
-
-                if not exists:
-                    # Try to find similar table names
-                    cur.execute("""
-                        SELECT table_name
-                        FROM information_schema.tables
-                        WHERE table_schema = %s
-                        AND table_name SIMILAR TO %s
-                        LIMIT 3
-                    """, (schema, f"%{table}%"))
-
-                    similar = [row[0] for row in cur.fetchall()]
-                    error_msg = f"Table '{table}' does not exist in schema '{schema}'"
-
-                    if similar:
-                        error_msg += f". Did you mean: {', '.join(similar)}?"
-
-                    errors.append(error_msg)
+            known = _cached_schema_tables(conn, schema, tables)
+            if known is None:
+                cur.execute(SCHEMA_TABLES_QUERY, (schema,))
+                known = _cache_schema_tables(conn, schema, cur)
+            errors = _missing_table_errors(cur, tables, known, schema)
 
         return len(errors) == 0, errors
 
@@ -198,6 +391,58 @@ def validate_against_schema(
         return True, []  # Don't fail validation on validation error
 
 
+def _hyperscan_expression(pattern: re.Pattern) -> bytes:
+    """
+    Rewrite a re pattern for Hyperscan, for matching ASCII input only
+
+    Args:
+        pattern: Compiled re pattern
+
+    Returns:
+        Hyperscan expression as bytes
+    """
+    def translate(match: re.Match) -> str:
+        return HS_WHITESPACE_CLASS if match.group() == r'\s' else match.group()
+
+    return re.sub(r'\\.', translate, pattern.pattern).encode()
+
+
+@functools.lru_cache(maxsize=1)
+def _load_injection_database():
+    """
+    Compile INJECTION_CHECKS into one Hyperscan database
+
+    End-anchored patterns stay with re: multi-pattern block databases miss
+    their matches at end of data once the input is longer than 16 bytes.
+
+    Returns:
+        Tuple of (database, ids of the checks left to re), or None if
+        hyperscan is unavailable
+    """
+    # hyperscan is optional, and only imported once a query is long enough
+    # to use it
+    try:
+        import hyperscan
+    except ImportError:
+        return None
+
+    scanned = [i for i, (pattern, _) in enumerate(INJECTION_CHECKS) if not pattern.pattern.endswith('$')]
+    anchored = [i for i in range(len(INJECTION_CHECKS)) if i not in scanned]
+
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[_hyperscan_expression(INJECTION_CHECKS[i][0]) for i in scanned],
+            ids=scanned,
+            elements=len(scanned),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(scanned)
+        )
+        return database, anchored
+    except Exception as e:
+        logger.debug(f"Hyperscan unavailable, using re: {e}")
+        return None
+
+
 def check_sql_injection_risk(sql: str) -> Tuple[bool, List[str]]:
     """
     Detect potential SQL injection patterns
@@ -208,32 +453,37 @@ def check_sql_injection_risk(sql: str) -> Tuple[bool, List[str]]:
     Returns:
         Tuple of (is_safe, list_of_warnings)
     """
-    warnings = []
+    sql_lc = sql.lower()
 
-    # Dangerous patterns
-    dangerous_patterns = [
-        (r";\s*DROP\s+", "Detected DROP statement after semicolon"),
-        (r";\s*DELETE\s+", "Detected DELETE statement after semicolon"),
-        (r";\s*UPDATE\s+", "Detected UPDATE statement after semicolon"),
-        (r";\s*INSERT\s+", "Detected INSERT statement after semicolon"),
-        (r"--\s*$", "SQL comment at end of query"),
-        (r"/\*.*\*/", "Block comment detected"),
-    ]
+    loaded = None
+    if len(sql_lc) >= HYPERSCAN_MIN_LENGTH and sql_lc.isascii():
+        loaded = _load_injection_database()
 
-    for pattern, warning in dangerous_patterns:
-        if re.search(pattern, sql, re.IGNORECASE):
-            warnings.append(warning)
+    if loaded is not None:
+        # One pass over the query for all unanchored patterns
+        database, anchored = loaded
+        matched = {i for i in anchored if INJECTION_CHECKS[i][0].search(sql_lc)}
 
-    # Check for string concatenation indicators
-    if re.search(r"\+\s*['\"]|['\"]\\s*\+", sql):
-        warnings.append("Possible string concatenation detected")
+        def on_match(pattern_id, start, end, flags, context):
+            matched.add(pattern_id)
+
+        database.scan(sql_lc.encode('ascii'), match_event_handler=on_match)
+        warnings = [warning for i, (_, warning) in enumerate(INJECTION_CHECKS) if i in matched]
+    else:
+        # Dangerous patterns and string concatenation indicators
+        warnings = [warning for pattern, warning in INJECTION_CHECKS if pattern.search(sql_lc)]
 
     # Note: This is basic detection. Parameterized queries are the real solution.
 
     return len(warnings) == 0, warnings
 
 
-def suggest_improvements(sql: str, conn: psycopg.Connection, schema: str = 'public') -> List[str]:
+def suggest_improvements(
+    sql: str,
+    conn: 'psycopg.Connection',
+    schema: str = 'public',
+    statement: Optional[Statement] = None
+) -> List[str]:
     """
     Provide optimization suggestions for SQL query
 
@@ -241,6 +491,7 @@ def suggest_improvements(sql: str, conn: psycopg.Connection, schema: str = 'publ
         sql: SQL query
         conn: Database connection
         schema: Schema name
+        statement: The query already parsed by sqlparse, if available
 
     Returns:
         List of improvement suggestions
@@ -248,28 +499,56 @@ def suggest_improvements(sql: str, conn: psycopg.Connection, schema: str = 'publ
     suggestions = []
 
     try:
+        statements = sqlparse.parse(sql) if statement is None else (statement,)
+
+        # One pass over the tokens; words inside literals and comments don't count
+        first = previous = None
+        has_star = has_where = has_limit = has_like_wildcard = False
+        for token in (token for stmt in statements for token in stmt.flatten()):
+            if token.is_whitespace:
+                continue
+
+            if token.ttype is Wildcard:
+                if previous is not None and previous.ttype is DML and previous.normalized == 'SELECT':
+                    has_star = True
+            elif token.ttype is Keyword:
+                if token.normalized == 'WHERE':
+                    has_where = True
+                elif token.normalized == 'LIMIT':
+                    has_limit = True
+            elif token.ttype in String:
+                if (previous is not None and previous.ttype is Comparison
+                        and previous.value.upper().endswith('LIKE') and token.value[1:2] == '%'):
+                    has_like_wildcard = True
+
+            if first is None:
+                first = token
+            previous = token
+
+        statement_type = first.normalized if first is not None and first.ttype is DML else None
+
         # Check for SELECT *
-        if re.search(r'SELECT\s+\*', sql, re.IGNORECASE):
+        if has_star:
             suggestions.append(
                 "Consider selecting specific columns instead of SELECT * for better performance"
             )
 
         # Check for missing WHERE clause in UPDATE/DELETE
-        if re.search(r'^\s*(UPDATE|DELETE)\s+', sql, re.IGNORECASE):
-            if not re.search(r'\bWHERE\b', sql, re.IGNORECASE):
+        if statement_type in ('UPDATE', 'DELETE'):
+            if not has_where:
                 suggestions.append(
                     "WARNING: UPDATE/DELETE without WHERE clause will affect all rows!"
                 )
 
         # Check for LIKE with leading wildcard
-        if re.search(r"LIKE\s+['\"]%", sql, re.IGNORECASE):
+        if has_like_wildcard:
             suggestions.append(
                 "LIKE with leading wildcard (%) cannot use indexes efficiently"
             )
 
         # Check for missing LIMIT on potentially large result sets
-        if re.search(r'^\s*SELECT\s+', sql, re.IGNORECASE):
-            if not re.search(r'\bLIMIT\b', sql, re.IGNORECASE):
+        if statement_type == 'SELECT':
+            if not has_limit:
                 suggestions.append(
                     "Consider adding LIMIT clause to restrict result set size"
                 )
@@ -281,10 +560,168 @@ def suggest_improvements(sql: str, conn: psycopg.Connection, schema: str = 'publ
         return suggestions
 
 
+def _explain_cursor(conn: 'psycopg.Connection') -> 'psycopg.Cursor':
+    """Open a cursor that decodes EXPLAIN's JSON output with orjson when available"""
+    # Text format on purpose: EXPLAIN returns json, not jsonb, and json's
+    # binary wire format is the same text, so binary=True saves no parsing
+    cur = conn.cursor()
+    if orjson is not None:
+        from psycopg.types.json import set_json_loads
+        set_json_loads(orjson.loads, cur)
+    return cur
+
+
+def _explain_command(sql: str, analyze: bool = False) -> str:
+    """Build the EXPLAIN statement for a query"""
+    explain_cmd = "EXPLAIN (FORMAT JSON, VERBOSE)"
+    if analyze:
+        explain_cmd = "EXPLAIN (FORMAT JSON, ANALYZE, VERBOSE)"
+    return f"{explain_cmd} {sql}"
+
+
+def _prepared_name(sql: str) -> str:
+    """Name the prepared statement for a query after a hash of its text"""
+    return f"text2sql_{hashlib.blake2b(sql.encode(), digest_size=8).hexdigest()}"
+
+
+def _prepare_explain_target(conn: 'psycopg.Connection', cur: 'psycopg.Cursor', sql: str) -> str:
+    """
+    PREPARE the query once per session and return what EXPLAIN should run
+
+    Repeated validations then EXPLAIN EXECUTE the prepared statement, so the
+    server skips parsing and can reuse its cached plan. Statements PREPARE
+    does not accept are explained as plain SQL instead.
+
+    Args:
+        conn: Database connection
+        cur: Cursor to run PREPARE on
+        sql: SQL query
+
+    Returns:
+        The EXECUTE statement, or the query itself if it cannot be prepared
+    """
+    import psycopg  # already loaded: the caller holds a connection
+
+    name = _prepared_name(sql)
+    names = _PREPARED_EXPLAINS.setdefault(conn, set())
+
+    if name not in names:
+        try:
+            cur.execute(f"PREPARE {name} AS {sql}")
+        except psycopg.errors.DuplicatePreparedStatement:
+            conn.rollback()
+        except Exception as e:
+            logger.debug(f"Cannot prepare query, explaining it directly: {e}")
+            conn.rollback()
+            return sql
+        # Prepared statements outlive the transaction, even if it rolls back
+        names.add(name)
+
+    return f"EXECUTE {name}"
+
+
+def _forget_prepared(conn: 'psycopg.Connection', sql: str) -> bool:
+    """
+    Drop a prepared statement the server no longer has, e.g. after DEALLOCATE ALL
+
+    Args:
+        conn: Database connection
+        sql: SQL query
+
+    Returns:
+        True if the query had been prepared on this connection
+    """
+    names = _PREPARED_EXPLAINS.get(conn)
+    name = _prepared_name(sql)
+    if names is None or name not in names:
+        return False
+    names.discard(name)
+    return True
+
+
+def _summarize_plan(result: List[Dict], analyze: bool = False) -> Dict:
+    """
+    Extract key metrics and issues from EXPLAIN output
+
+    Args:
+        result: Parsed EXPLAIN (FORMAT JSON) output
+        analyze: Whether the plan came from EXPLAIN ANALYZE
+
+    Returns:
+        Dictionary with explanation data
+    """
+    plan = result[0]
+
+    # Extract key metrics
+    execution_time = plan.get('Execution Time')
+    planning_time = plan.get('Planning Time')
+    total_cost = plan['Plan'].get('Total Cost')
+    rows = plan['Plan'].get('Plan Rows')
+
+    # Find potential issues
+    issues = []
+    warnings = []
+
+    # Walk the plan tree depth-first, parents before children
+    stack = [plan['Plan']]
+    while stack:
+        node = stack.pop()
+        node_type = node.get('Node Type', '')
+
+        # Check for sequential scans on large tables
+        if node_type == 'Seq Scan':
+            rows_scanned = node.get('Plan Rows', 0)
+            if rows_scanned > 1000:
+                table = node.get('Relation Name', 'unknown')
+                warnings.append(
+                    f"Sequential scan on table '{table}' (~{rows_scanned:,} rows). "
+                    "Consider adding an index."
+                )
+
+        # Check for nested loops with high iterations
+        if node_type == 'Nested Loop':
+            loops = node.get('Actual Loops', 1) if analyze else 1
+            if loops > 100:
+                warnings.append(
+                    f"Nested loop with {loops} iterations may be slow. "
+                    "Consider optimizing JOIN conditions."
+                )
+
+        # Reversed so the first child is checked next
+        children = node.get('Plans')
+        if children:
+            stack.extend(reversed(children))
+
+    return {
+        'success': True,
+        'plan': plan,
+        'execution_time_ms': execution_time,
+        'planning_time_ms': planning_time,
+        'total_cost': total_cost,
+        'estimated_rows': rows,
+        'warnings': warnings,
+        'issues': issues
+    }
+
+
+def _run_explain(
+    conn: 'psycopg.Connection',
+    sql: str,
+    analyze: bool = False,
+    prepare: bool = False
+) -> Dict:
+    """Run EXPLAIN and summarize the plan, raising on database errors"""
+    with _explain_cursor(conn) as cur:
+        target = _prepare_explain_target(conn, cur, sql) if prepare else sql
+        cur.execute(_explain_command(target, analyze))
+        return _summarize_plan(cur.fetchone()[0], analyze)
+
+
 def explain_query_plan(
-    conn: psycopg.Connection,
+    conn: 'psycopg.Connection',
     sql: str,
-    analyze: bool = False
+    analyze: bool = False,
+    prepare: bool = False
 ) -> Dict:
     """
     Run EXPLAIN on query and parse results
@@ -293,70 +730,24 @@ def explain_query_plan(
         conn: Database connection
         sql: SQL query
         analyze: Whether to run EXPLAIN ANALYZE (actually executes query)
+        prepare: Whether to PREPARE the query so repeated calls on this
+            connection skip parsing and planning
 
     Returns:
         Dictionary with explanation data
     """
-    try:
-        explain_cmd = "EXPLAIN (FORMAT JSON, VERBOSE)"
-        if analyze:
-            explain_cmd = "EXPLAIN (FORMAT JSON, ANALYZE, VERBOSE)"
+    import psycopg  # already loaded: the caller holds a connection
 
-        with conn.cursor() as cur:
-            cur.execute(f"{explain_cmd} {sql}")
-            result = cur.fetchone()[0]
-
-            plan = result[0]
-
-            # Extract key metrics
-            execution_time = plan.get('Execution Time')
-            planning_time = plan.get('Planning Time')
-            total_cost = plan['Plan'].get('Total Cost')
-            rows = plan['Plan'].get('Plan Rows')
-
-            # Find potential issues
-            issues = []
-            warnings = []
-
-            def check_plan_node(node):
-                """Recursively check plan nodes for issues"""
-                node_type = node.get('Node Type', '')
-
-                # Check for sequential scans on large tables
-                if node_type == 'Seq Scan':
-                    rows_scanned = node.get('Plan Rows', 0)
-                    if rows_scanned > 1000:
-                        table = node.get('Relation Name', 'unknown')
-                        warnings.append(
-                            f"Sequential scan on table '{table}' (~{rows_scanned:,} rows). "
-                            "Consider adding an index."
-                        )
-
-                # Check for nested loops with high iterations
-                if node_type == 'Nested Loop':
-                    loops = node.get('Actual Loops', 1) if analyze else 1
-                    if loops > 100:
-                        warnings.append(
-                            f"Nested loop with {loops} iterations may be slow. "
-                            "Consider optimizing JOIN conditions."
-                        )
-
-                # Recursively check child nodes
-                for child in node.get('Plans', []):
-                    check_plan_node(child)
-
-            check_plan_node(plan['Plan'])
-
-            return {
-                'success': True,
-                'plan': plan,
-                'execution_time_ms': execution_time,
-                'planning_time_ms': planning_time,
-                'total_cost': total_cost,
-                'estimated_rows': rows,
-                'warnings': warnings,
-                'issues': issues
-            }
+    try:
+        try:
+            return _run_explain(conn, sql, analyze, prepare)
+        except psycopg.errors.InvalidSqlStatementName:
+            # Our prepared statement was deallocated behind our back: prepare
+            # it again, once. Anything else is the query's own error
+            if not (prepare and _forget_prepared(conn, sql)):
+                raise
+            conn.rollback()
+            return _run_explain(conn, sql, analyze, prepare)
 
     except Exception as e:
         return {
@@ -366,12 +757,99 @@ def explain_query_plan(
         }
 
 
+def _validate_and_explain_pipelined(
+    conn: 'psycopg.Connection',
+    sql: str,
+    schema: str = 'public',
+    statement: Optional[Statement] = None,
+    prepare: bool = False
+) -> Tuple[bool, List[str], Dict]:
+    """
+    Run the table-existence check and a plain EXPLAIN in one round trip
+
+    Only used without ANALYZE: the EXPLAIN is sent before the schema check
+    has been read, so it must have no side effects.
+
+    Args:
+        conn: Database connection
+        sql: SQL query
+        schema: Schema name
+        statement: The query already parsed by sqlparse, if available
+        prepare: Whether to EXPLAIN a prepared statement (see explain_query_plan)
+
+    Returns:
+        Tuple of (is_valid, list_of_errors, explain_result)
+    """
+    import psycopg  # already loaded: the caller holds a connection
+
+    explain_error = None
+    explain_result = None
+
+    try:
+        tables = extract_table_names(sql, statement)
+        known = _cached_schema_tables(conn, schema, tables) if tables else frozenset()
+
+        with conn.cursor() as cur, _explain_cursor(conn) as explain_cur:
+            # PREPARE runs ahead of the pipeline, on the first call only
+            target = _prepare_explain_target(conn, explain_cur, sql) if prepare else sql
+
+            try:
+                # Leaving the block syncs once and raises the first error
+                with conn.pipeline():
+                    if known is None:
+                        cur.execute(SCHEMA_TABLES_QUERY, (schema,))
+                    explain_cur.execute(_explain_command(target))
+
+            except Exception as e:
+                conn.rollback()
+
+                # The pipeline raises the first error; if the table lookup
+                # itself failed there is nothing to validate against
+                if known is None and cur.description is None:
+                    raise
+                explain_error = e
+
+            if known is None:
+                known = _cache_schema_tables(conn, schema, cur)
+            errors = _missing_table_errors(cur, tables, known, schema)
+
+            if explain_error is None:
+                explain_result = _summarize_plan(explain_cur.fetchone()[0])
+            elif (isinstance(explain_error, psycopg.errors.InvalidSqlStatementName)
+                    and prepare and _forget_prepared(conn, sql)):
+                # Our prepared statement was deallocated: prepare it again, once
+                try:
+                    explain_result = _run_explain(conn, sql, prepare=True)
+                except Exception as e:
+                    conn.rollback()
+                    explain_error = e
+
+            if explain_result is None:
+                explain_result = {
+                    'success': False,
+                    'error': str(explain_error),
+                    'plan': None
+                }
+
+        return len(errors) == 0, errors, explain_result
+
+    except Exception as e:
+        logger.debug(f"Error validating schema: {e}")
+        # Don't fail validation on validation error
+        return True, [], {
+            'success': False,
+            'error': str(e),
+            'plan': None
+        }
+
+
 def validate_and_explain(
-    conn: psycopg.Connection,
+    conn: 'psycopg.Connection',
     sql: str,
     schema: str = 'public',
     explain: bool = False,
-    analyze: bool = False
+    analyze: bool = False,
+    prepare: bool = False
 ) -> Dict:
     """
     Complete validation with optional explanation
@@ -382,10 +860,14 @@ def validate_and_explain(
         schema: Schema name
         explain: Whether to run EXPLAIN
         analyze: Whether to run EXPLAIN ANALYZE
+        prepare: Whether to EXPLAIN a prepared statement, for callers that
+            validate the same query repeatedly on one connection
 
     Returns:
         Dictionary with complete validation results
     """
+    import psycopg  # already loaded: the caller holds a connection
+
     result = {
         'sql': sql,
         'valid': False,
@@ -395,14 +877,26 @@ def validate_and_explain(
         'explain': None
     }
 
+    # Parse once for both the syntax check and table extraction; on failure
+    # validate_syntax parses again and reports the error
+    try:
+        parsed = sqlparse.parse(sql)
+    except Exception:
+        parsed = None
+
     # Syntax validation
-    syntax_valid, syntax_error = validate_syntax(sql)
+    syntax_valid, syntax_error = validate_syntax(sql, parsed)
     if not syntax_valid:
         result['errors'].append(syntax_error)
         return result
+    statement = parsed[0]
 
-    # Schema validation
-    schema_valid, schema_errors = validate_against_schema(sql, conn, schema)
+    # Schema validation, pipelined with EXPLAIN when it has no side effects
+    explain_result = None
+    if explain and not analyze and psycopg.Pipeline.is_supported():
+        schema_valid, schema_errors, explain_result = _validate_and_explain_pipelined(conn, sql, schema, statement, prepare)
+    else:
+        schema_valid, schema_errors = validate_against_schema(sql, conn, schema, statement)
     if not schema_valid:
         result['errors'].extend(schema_errors)
         return result
@@ -413,7 +907,7 @@ def validate_and_explain(
         result['warnings'].extend(security_warnings)
 
     # Optimization suggestions
-    suggestions = suggest_improvements(sql, conn, schema)
+    suggestions = suggest_improvements(sql, conn, schema, statement)
     result['suggestions'].extend(suggestions)
 
     # Mark as valid
@@ -421,7 +915,8 @@ def validate_and_explain(
 
     # Run EXPLAIN if requested
     if explain or analyze:
-        explain_result = explain_query_plan(conn, sql, analyze=analyze)
+        if explain_result is None:
+            explain_result = explain_query_plan(conn, sql, analyze=analyze, prepare=prepare)
 
         if explain_result['success']:
             result['explain'] = explain_result
@@ -447,71 +942,83 @@ def format_validation_output(validation: Dict, format_type: str = 'markdown') ->
         Formatted string
     """
     if format_type == 'json':
-        return json.dumps(validation, indent=2, default=str)
+        return dumps_json(validation).decode('utf-8')
+
+    return '\n'.join(iter_validation_output_lines(validation))
+
+
+def iter_validation_output_lines(validation: Dict) -> Iterator[str]:
+    """
+    Yield the lines of the markdown validation output
+
+    main() writes these straight to stdout, so a long query is not copied
+    into a joined document before printing.
 
-    # Markdown format
-    lines = []
-    lines.append("# SQL Validation Results")
-    lines.append("")
+    Args:
+        validation: Validation result dictionary
+
+    Yields:
+        Output lines without trailing newlines
+    """
+    yield "# SQL Validation Results"
+    yield ""
 
     # Status
     if validation['valid']:
-        lines.append("**Status:** ✓ Valid")
+        yield "**Status:** ✓ Valid"
     else:
-        lines.append("**Status:** ✗ Invalid")
+        yield "**Status:** ✗ Invalid"
 
-    lines.append("")
+    yield ""
 
     # Query
-    lines.append("## Query")
-    lines.append("```sql")
-    lines.append(validation['sql'])
-    lines.append("```")
-    lines.append("")
+    yield "## Query"
+    yield "```sql"
+    yield validation['sql']
+    yield "```"
+    yield ""
 
     # Errors
     if validation['errors']:
-        lines.append("## Errors")
+        yield "## Errors"
         for error in validation['errors']:
-            lines.append(f"- ❌ {error}")
-        lines.append("")
+            yield f"- ❌ {error}"
+        yield ""
 
     # Warnings
     if validation['warnings']:
-        lines.append("## Warnings")
+        yield "## Warnings"
         for warning in validation['warnings']:
-            lines.append(f"- ⚠️  {warning}")
-        lines.append("")
+            yield f"- ⚠️  {warning}"
+        yield ""
 
     # Suggestions
     if validation['suggestions']:
-        lines.append("## Suggestions")
+        yield "## Suggestions"
         for suggestion in validation['suggestions']:
-            lines.append(f"- 💡 {suggestion}")
-        lines.append("")
+            yield f"- 💡 {suggestion}"
+        yield ""
 
     # EXPLAIN results
     if validation.get('explain'):
         explain = validation['explain']
 
-        lines.append("## Query Plan Analysis")
-        lines.append("")
+        yield "## Query Plan Analysis"
+        yield ""
 
         if explain.get('execution_time_ms') is not None:
-            lines.append(f"- **Execution Time:** {explain['execution_time_ms']:.2f} ms")
+            yield f"- **Execution Time:** {explain['execution_time_ms']:.2f} ms"
 
         if explain.get('planning_time_ms') is not None:
-            lines.append(f"- **Planning Time:** {explain['planning_time_ms']:.2f} ms")
+            yield f"- **Planning Time:** {explain['planning_time_ms']:.2f} ms"
 
         if explain.get('total_cost') is not None:
-            lines.append(f"- **Estimated Cost:** {explain['total_cost']:.2f}")
+            yield f"- **Estimated Cost:** {explain['total_cost']:.2f}"
 
         if explain.get('estimated_rows') is not None:
-            lines.append(f"- **Estimated Rows:** {explain['estimated_rows']:,}")
-
-        lines.append("")
+            yield f"- **Estimated Rows:** {explain['estimated_rows']:,}"
 
-    return '\n'.join(lines)
+        yield ""
 
 
 def main():
@@ -607,9 +1114,11 @@ Examples:
             analyze=args.analyze
         )
 
-        # Format output
-        output = format_validation_output(result, args.output_format)
-        print(output)
+        # Format and output; markdown is streamed line by line
+        if args.output_format == 'json':
+            print(format_validation_output(result, args.output_format))
+        else:
+            sys.stdout.writelines(line + '\n' for line in iter_validation_output_lines(result))
 
         conn.close()
 